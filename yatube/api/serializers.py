@@ -0,0 +1,39 @@
+"""Представление постов и комментариев в JSON.
+
+Клиент может запросить только нужные поля: ``?fields=id,text``.
+"""
+POST_FIELDS = {
+    'id': lambda post: post.id,
+    'text': lambda post: post.text,
+    'pub_date': lambda post: post.pub_date,
+    'author': lambda post: post.author.username,
+    'group': lambda post: post.group.slug if post.group_id else None,
+    'image': lambda post: post.image.url if post.image else None,
+    'comments_count': lambda post: post.comments_count,
+}
+COMMENT_FIELDS = {
+    'id': lambda comment: comment.id,
+    'author': lambda comment: comment.author.username,
+    'text': lambda comment: comment.text,
+    'created': lambda comment: comment.created,
+}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def requested_fields(request, available):
+    """Поля из параметра ``fields`` или все доступные."""
+    value = request.GET.get('fields')
+    if not value:
+        return list(available)
+    fields = [field for field in value.split(',') if field]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise FieldsError(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields
+
+
+def serialize(obj, fields, available):
+    return {field: available[field](obj) for field in fields}
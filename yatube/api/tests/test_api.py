@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Comment, Follow, Group, Post, User
+from posts.views import NUMBER_OF_POSTS
+
+
+class FeedApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='api_author')
+        cls.reader = User.objects.create_user(username='api_reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='api-group', description=''
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Пост {i}'
+            )
+            for i in range(NUMBER_OF_POSTS + 2)
+        ]
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_feeds(self):
+        """Ленты отдают посты автора в JSON."""
+        urls = (
+            reverse('api:index'),
+            reverse('api:group_list', args=[self.group.slug]),
+            reverse('api:profile', args=[self.author.username]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                data = self.client.get(url).json()
+                self.assertEqual(len(data['results']), NUMBER_OF_POSTS)
+                self.assertEqual(data['results'][0], {
+                    'id': self.posts[-1].id,
+                    'text': self.posts[-1].text,
+                    'pub_date': data['results'][0]['pub_date'],
+                    'author': self.author.username,
+                    'group': self.group.slug,
+                    'image': None,
+                    'comments_count': 0,
+                })
+
+    def test_cursor_pagination(self):
+        """Курсор ``next`` ведёт на следующую страницу."""
+        url = reverse('api:index')
+        first = self.client.get(url).json()
+        second = self.client.get(url, {'cursor': first['next']}).json()
+        self.assertEqual(
+            [post['id'] for post in first['results'] + second['results']],
+            [post.id for post in reversed(self.posts)],
+        )
+        self.assertIsNone(second['next'])
+        self.assertIsNotNone(second['previous'])
+
+    def test_sparse_fields(self):
+        """В ответе только запрошенные поля, неизвестное поле — 400."""
+        url = reverse('api:index')
+        data = self.client.get(url, {'fields': 'id,author'}).json()
+        self.assertEqual(
+            data['results'][0],
+            {'id': self.posts[-1].id, 'author': self.author.username},
+        )
+        response = self.client.get(url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_not_modified(self):
+        """Неизменившаяся страница отдаётся как 304 без запросов к БД,
+        а после изменения данных — заново.
+        """
+        url = reverse('api:index')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.create(author=self.author, text='Новый пост')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_follow_feed(self):
+        """Лента подписок доступна только авторизованному."""
+        url = reverse('api:follow_index')
+        self.assertEqual(
+            self.client.get(url).status_code, HTTPStatus.UNAUTHORIZED
+        )
+        self.client.force_login(self.reader)
+        data = self.client.get(url).json()
+        self.assertEqual(len(data['results']), NUMBER_OF_POSTS)
+
+    def test_post_detail(self):
+        """Пост отдаётся с первой страницей комментариев."""
+        post = self.posts[0]
+        comment = Comment.objects.create(
+            post=post, author=self.reader, text='Комментарий'
+        )
+        url = reverse('api:post_detail', args=[post.id])
+        data = self.client.get(url).json()
+        self.assertEqual(data['text'], post.text)
+        self.assertEqual(data['comments']['results'][0]['id'], comment.id)
+        data = self.client.get(url, {'fields': 'id'}).json()
+        self.assertEqual(data, {'id': post.id})
+        response = self.client.get(reverse('api:post_detail', args=[0]))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
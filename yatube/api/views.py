@@ -0,0 +1,118 @@
+from functools import partial, wraps
+from http import HTTPStatus
+
+from core.routers import read_from_replica
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+from django.views.decorators.vary import vary_on_cookie
+from posts.cache import cache_feed, feed_condition
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator
+from posts.timeline import TimelinePaginator
+from posts.views import NUMBER_OF_POSTS, comments_page
+
+from .serializers import (COMMENT_FIELDS, POST_FIELDS, FieldsError,
+                          requested_fields, serialize)
+
+DETAIL_FIELDS = (*POST_FIELDS, 'comments')
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def json_response(data, status=HTTPStatus.OK):
+    return JsonResponse(data, status=status, json_dumps_params=JSON_PARAMS)
+
+
+def error_response(detail, status):
+    return json_response({'detail': detail}, status)
+
+
+def feed_view(view=None, per_user=False):
+    """Ответ API для ленты: неизменившаяся страница отдаётся как 304
+    по ETag или Last-Modified ещё до обращения к БД, изменившаяся —
+    из кэша лент или строится по реплике.
+    """
+    if view is None:
+        return partial(feed_view, per_user=per_user)
+    return require_safe(feed_condition(read_from_replica(
+        cache_feed(view, per_user=per_user)
+    )))
+
+
+def login_required_json(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return error_response(
+                'Нужна авторизация', HTTPStatus.UNAUTHORIZED
+            )
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def feed_response(request, posts, paginator_class=CursorPaginator,
+                  **kwargs):
+    try:
+        fields = requested_fields(request, POST_FIELDS)
+    except FieldsError as error:
+        return error_response(str(error), HTTPStatus.BAD_REQUEST)
+    paginator = paginator_class(posts, NUMBER_OF_POSTS, **kwargs)
+    page = paginator.get_cursor_page(request.GET.get('cursor'))
+    return json_response({
+        'results': [serialize(post, fields, POST_FIELDS) for post in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@feed_view
+def index(request):
+    return feed_response(request, Post.objects.for_feed())
+
+
+@feed_view
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).first()
+    if group is None:
+        return error_response('Группа не найдена', HTTPStatus.NOT_FOUND)
+    return feed_response(request, group.posts.for_feed())
+
+
+@feed_view
+def profile(request, username):
+    author = User.objects.filter(username=username).first()
+    if author is None:
+        return error_response('Автор не найден', HTTPStatus.NOT_FOUND)
+    return feed_response(request, author.posts.for_feed())
+
+
+@login_required_json
+@vary_on_cookie
+@feed_view(per_user=True)
+def follow_index(request):
+    return feed_response(
+        request, Post.objects.for_feed(), TimelinePaginator, user=request.user
+    )
+
+
+@feed_view
+def post_detail(request, post_id):
+    try:
+        fields = requested_fields(request, DETAIL_FIELDS)
+    except FieldsError as error:
+        return error_response(str(error), HTTPStatus.BAD_REQUEST)
+    post = Post.objects.for_feed().filter(pk=post_id).first()
+    if post is None:
+        return error_response('Пост не найден', HTTPStatus.NOT_FOUND)
+    data = serialize(
+        post, [field for field in fields if field != 'comments'], POST_FIELDS
+    )
+    if 'comments' in fields:
+        comments = comments_page(request, post)
+        data['comments'] = {
+            'results': [
+                serialize(comment, COMMENT_FIELDS, COMMENT_FIELDS)
+                for comment in comments
+            ],
+            'next': comments.next_cursor,
+        }
+    return json_response(data)
@@ -0,0 +1,80 @@
+"""Сжатие значений кэша.
+
+Отрендеренные страницы и выборки хорошо сжимаются, а кэш в памяти
+процесса или в Redis ограничен по объёму, поэтому крупные значения
+хранятся в виде pickle, сжатого zlib.
+"""
+import pickle
+import zlib
+
+from django.core.cache.backends.locmem import LocMemCache
+
+COMPRESS_LEVEL = 6
+MIN_COMPRESS_LENGTH = 1024
+RAW = b'\x00'
+COMPRESSED = b'\x01'
+
+
+def dumps(value, level=COMPRESS_LEVEL, min_length=MIN_COMPRESS_LENGTH):
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    if len(data) < min_length:
+        return RAW + data
+    return COMPRESSED + zlib.compress(data, level)
+
+
+def loads(data):
+    marker, payload = data[:1], data[1:]
+    if marker == COMPRESSED:
+        payload = zlib.decompress(payload)
+    return pickle.loads(payload)
+
+
+class CompressedPickleSerializer:
+    """Сериализатор для django-redis (``OPTIONS['SERIALIZER']``)."""
+
+    def __init__(self, options):
+        self.level = options.get('COMPRESS_LEVEL', COMPRESS_LEVEL)
+        self.min_length = options.get(
+            'MIN_COMPRESS_LENGTH', MIN_COMPRESS_LENGTH
+        )
+
+    def dumps(self, value):
+        return dumps(value, self.level, self.min_length)
+
+    def loads(self, value):
+        return loads(value)
+
+
+class Compressed(bytes):
+    """Сжатое значение в локальном кэше."""
+
+
+class CompressedLocMemCache(LocMemCache):
+    """Кэш в памяти процесса, хранящий крупные значения сжатыми.
+
+    Мелкие значения (в том числе счётчики для ``incr``) хранятся
+    как обычно.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get('OPTIONS', {})
+        self.serializer = CompressedPickleSerializer(options)
+
+    def _pack(self, value):
+        data = self.serializer.dumps(value)
+        if data[:1] == RAW:
+            return value
+        return Compressed(data)
+
+    def add(self, key, value, *args, **kwargs):
+        return super().add(key, self._pack(value), *args, **kwargs)
+
+    def set(self, key, value, *args, **kwargs):
+        super().set(key, self._pack(value), *args, **kwargs)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if isinstance(value, Compressed):
+            return self.serializer.loads(value)
+        return value
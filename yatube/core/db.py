@@ -0,0 +1,11 @@
+"""Настройка соединений с SQLite."""
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Выполняет ``SQLITE_PRAGMAS`` на новом соединении с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,105 @@
+"""Кэш страниц с «дырками» (hole punching).
+
+Кэшируется общий для всех пользователей «скелет» страницы. Части,
+зависящие от пользователя (вход в шапке, кнопки подписки
+и редактирования, форма комментария с CSRF-токеном), выводятся тегом
+``{% hole %}`` как метки-комментарии. ``HoleMiddleware`` заменяет метки
+фрагментами, отрисованными для текущего запроса, — и в только что
+построенной странице, и в странице из кэша.
+
+Для анонимного пользователя фрагмент не должен зависеть от запроса:
+он отрисовывается один раз и хранится в памяти процесса.
+"""
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from django.template.loader import render_to_string
+
+MARKER_PREFIX = '<!--hole:'
+MARKER_RE = re.compile(r'<!--hole:(?P<name>\w+)(?:\?(?P<query>[^<>]*?))?-->')
+ANONYMOUS_CACHE_SIZE = 1000
+
+HOLES = {}
+_anonymous = {}
+
+
+def register(name, template_name):
+    """Регистрирует дырку ``name``; декорируемая функция
+    ``(request, **params)`` возвращает контекст её шаблона.
+    """
+    def decorator(func):
+        HOLES[name] = (template_name, func)
+        return func
+    return decorator
+
+
+def marker(name, params):
+    """Метка дырки в скелете страницы."""
+    if name not in HOLES:
+        raise KeyError(f'Дырка {name!r} не зарегистрирована')
+    text = MARKER_PREFIX + name
+    if params:
+        text += '?' + urlencode(sorted(params.items()))
+    return text + '-->'
+
+
+def render_hole(request, name, query):
+    template_name, func = HOLES[name]
+    params = dict(parse_qsl(query))
+    return render_to_string(
+        template_name, func(request, **params), request=request
+    )
+
+
+def fill(request, content):
+    """Заменяет метки в тексте страницы фрагментами для ``request``.
+    Метки незарегистрированных дырок остаются как есть.
+    """
+    anonymous = not request.user.is_authenticated
+
+    def replace(match):
+        name, query = match.group('name'), match.group('query') or ''
+        if name not in HOLES:
+            return match.group(0)
+        if not anonymous:
+            return render_hole(request, name, query)
+        key = (name, query)
+        if key not in _anonymous:
+            if len(_anonymous) >= ANONYMOUS_CACHE_SIZE:
+                _anonymous.clear()
+            _anonymous[key] = render_hole(request, name, query)
+        return _anonymous[key]
+
+    return MARKER_RE.sub(replace, content)
+
+
+class HoleMiddleware:
+    """Заполняет дырки в HTML-ответах.
+
+    Стоит в конце ``MIDDLEWARE``: ответ заполняется раньше, чем
+    сессии и CSRF допишут свои заголовки и cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+        if MARKER_PREFIX.encode() not in response.content:
+            return response
+        response.content = fill(
+            request, response.content.decode(response.charset)
+        )
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+@register('user_nav', 'includes/user_nav.html')
+def user_nav(request):
+    return {}
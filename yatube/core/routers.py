@@ -0,0 +1,85 @@
+"""Чтение лент с реплик БД.
+
+Реплики перечислены в настройке ``DATABASE_REPLICAS``. На случайную
+реплику уходят только чтения моделей из ``REPLICA_APPS`` внутри
+представлений, помеченных ``read_from_replica``. Остальные запросы
+и все записи идут в основную БД.
+
+Представления с записью помечаются ``stick_to_primary``: после
+успешной записи пользователь получает cookie и ``REPLICA_LAG`` секунд
+читает только основную БД, чтобы видеть свои изменения, пока реплики
+их догоняют.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_COOKIE = 'use_primary'
+
+_replica = ContextVar('replica', default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in settings.REPLICA_APPS:
+            return _replica.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной БД.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схема попадает на реплики вместе с данными.
+        return db not in settings.DATABASE_REPLICAS
+
+
+def reading_from_replica():
+    """Читает ли текущий запрос реплику."""
+    return _replica.get() is not None
+
+
+def read_from_replica(view):
+    """Читает данные страницы с реплики, если пользователь недавно
+    ничего не записывал.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in ('GET', 'HEAD')
+            or PRIMARY_COOKIE in request.COOKIES
+        ):
+            return view(request, *args, **kwargs)
+        token = _replica.set(random.choice(settings.DATABASE_REPLICAS))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+    return wrapper
+
+
+def stick_to_primary(view):
+    """После записи (ответ-перенаправление) пользователь читает
+    основную БД ``REPLICA_LAG`` секунд.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and response.status_code == HTTPStatus.FOUND
+        ):
+            response.set_cookie(
+                PRIMARY_COOKIE, '1',
+                max_age=settings.REPLICA_LAG, httponly=True,
+            )
+        return response
+    return wrapper
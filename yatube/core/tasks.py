@@ -0,0 +1,49 @@
+"""Фоновые задачи в пуле потоков процесса.
+
+Задача ставится в пул только после фиксации текущей транзакции, чтобы
+увидеть сохранённые данные. Ошибки задач пишутся в лог и не доходят
+до запроса. Для тестов и команд есть синхронный режим
+``BACKGROUND_TASKS_EAGER``.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix='background',
+            )
+    return _executor
+
+
+def run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась ошибкой', func)
+    finally:
+        # Соединения с БД у каждого потока свои, закрываем их сразу.
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """Выполняет ``func`` в фоне после фиксации текущей транзакции."""
+    if settings.BACKGROUND_TASKS_EAGER:
+        func(*args, **kwargs)
+        return
+    transaction.on_commit(
+        lambda: get_executor().submit(run, func, args, kwargs)
+    )
@@ -0,0 +1,11 @@
+from core import holes
+from django import template
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def hole(name, **params):
+    """Метка дырки ``name``, которую заполнит ``HoleMiddleware``."""
+    return mark_safe(holes.marker(name, params))
@@ -0,0 +1,67 @@
+import tempfile
+
+from core.cache import (CompressedLocMemCache, CompressedPickleSerializer,
+                        dumps, loads)
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+
+class CompressedCacheTests(TestCase):
+    PAGE = '<article>Текст поста</article>' * 1000
+
+    def test_dumps_compresses_large_values(self):
+        """Крупные значения сжимаются, мелкие — нет."""
+        data = dumps(self.PAGE)
+        self.assertLess(len(data), len(self.PAGE) // 10)
+        self.assertEqual(loads(data), self.PAGE)
+        self.assertEqual(loads(dumps(42)), 42)
+
+    def test_serializer_roundtrip(self):
+        """Сериализатор для django-redis учитывает настройки."""
+        serializer = CompressedPickleSerializer({'MIN_COMPRESS_LENGTH': 10})
+        value = {'text': 'короткий текст'}
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    def test_locmem_stores_large_values_compressed(self):
+        """Локальный кэш хранит сжатые значения и поддерживает incr."""
+        backend = CompressedLocMemCache('compressed-test', {})
+        backend.set('page', self.PAGE)
+        self.assertEqual(backend.get('page'), self.PAGE)
+        stored = backend._cache[backend.make_key('page')]
+        self.assertLess(len(stored), len(self.PAGE) // 10)
+        backend.add('hits', 1)
+        self.assertEqual(backend.incr('hits'), 2)
+        self.assertEqual(
+            backend.get_many(['page', 'hits']),
+            {'page': self.PAGE, 'hits': 2}
+        )
+
+
+class SharedCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_file_cache_is_shared_between_workers(self):
+        """Файловый кэш виден всем процессам сервера."""
+        first = FileBasedCache(self.directory.name, {})
+        second = FileBasedCache(self.directory.name, {})
+        first.set('feed:version', 'v1')
+        self.assertEqual(second.get('feed:version'), 'v1')
+
+    def test_feed_pages_use_shared_cache(self):
+        """Страницы ленты кэшируются в общем файловом кэше."""
+        caches = {
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.directory.name,
+            }
+        }
+        with override_settings(CACHES=caches):
+            Client().get(reverse('posts:index'))
+            response = Client().get(reverse('posts:index'))
+            self.assertIsNone(response.context)
+            cache.clear()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SqlitePragmaTests(SimpleTestCase):
+    @override_settings(SQLITE_PRAGMAS={
+        'journal_mode': 'wal', 'synchronous': 'normal', 'cache_size': -2048,
+    })
+    def test_pragmas_applied_to_new_connections(self):
+        """На новом соединении с файлом БД включены WAL и остальные
+        PRAGMA из настроек.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper(
+                {
+                    **connection.settings_dict,
+                    'NAME': os.path.join(directory, 'pragma.sqlite3'),
+                },
+                alias='pragma_test',
+            )
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {}
+                    for pragma in ('journal_mode', 'synchronous',
+                                   'cache_size'):
+                        cursor.execute(f'PRAGMA {pragma}')
+                        values[pragma] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+        # synchronous = NORMAL возвращается числом 1.
+        self.assertEqual(
+            values, {'journal_mode': 'wal', 'synchronous': 1,
+                     'cache_size': -2048}
+        )
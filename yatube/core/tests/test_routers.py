@@ -0,0 +1,109 @@
+import os
+import tempfile
+from io import StringIO
+
+from core.routers import (PRIMARY_COOKIE, ReplicaRouter, read_from_replica,
+                          stick_to_primary)
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse, HttpResponseRedirect
+from django.test import (Client, RequestFactory, SimpleTestCase,
+                         TransactionTestCase, override_settings)
+from django.urls import reverse
+from posts.models import Post, User
+
+REPLICA = 'replica_test'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def read_databases(self, request):
+        @read_from_replica
+        def view(request):
+            return [
+                self.router.db_for_read(Post),
+                self.router.db_for_read(User),
+            ]
+        return view(request)
+
+    def test_feed_reads_go_to_replica(self):
+        """Посты страницы читаются с реплики, пользователи — из основной
+        БД.
+        """
+        self.assertEqual(
+            self.read_databases(self.factory.get('/')), [REPLICA, None]
+        )
+        self.assertIsNone(self.router.db_for_read(Post))
+
+    def test_primary_after_write(self):
+        """Запросы с cookie после записи и не-GET запросы читают
+        основную БД.
+        """
+        request = self.factory.get('/')
+        request.COOKIES[PRIMARY_COOKIE] = '1'
+        self.assertEqual(self.read_databases(request), [None, None])
+        self.assertEqual(
+            self.read_databases(self.factory.post('/')), [None, None]
+        )
+
+    def test_write_sets_cookie(self):
+        """Cookie ставится только после успешной записи."""
+        @stick_to_primary
+        def view(request, response):
+            return response
+
+        request = self.factory.post('/')
+        response = view(request, HttpResponseRedirect('/'))
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+        response = view(request, HttpResponse())
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class SqliteReplicaTests(TransactionTestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        connections.databases[REPLICA] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': cls.path,
+        }
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections.databases[REPLICA]
+        os.remove(cls.path)
+
+    def test_feed_read_from_replica_until_user_writes(self):
+        """Лента читается с копии основной БД, а автор после записи
+        видит свои изменения из основной.
+        """
+        user = User.objects.create_user(username='replica_author')
+        Post.objects.create(author=user, text='Пост на реплике')
+        call_command('sync_replicas', stdout=StringIO())
+        cache.clear()
+        client = Client()
+        client.force_login(user)
+        response = client.post(
+            reverse('posts:post_create'), {'text': 'Пост после копии'}
+        )
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+
+        reader = Client()
+        response = reader.get(reverse('posts:index'))
+        self.assertContains(response, 'Пост на реплике')
+        self.assertNotContains(response, 'Пост после копии')
+        self.assertContains(
+            client.get(reverse('posts:index')), 'Пост после копии'
+        )
@@ -0,0 +1,26 @@
+import copy
+
+from core.warmup import template_names, warm_up_templates
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+CACHED_TEMPLATES = copy.deepcopy(settings.TEMPLATES)
+CACHED_TEMPLATES[0]['APP_DIRS'] = False
+CACHED_TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class TemplateWarmUpTests(SimpleTestCase):
+    def test_all_project_templates_compiled(self):
+        """Прогрев компилирует все шаблоны проекта в кэш загрузчика."""
+        names = set(template_names(settings.TEMPLATES_DIR))
+        self.assertIn('posts/includes/post.html', names)
+        self.assertEqual(warm_up_templates(), len(names))
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertEqual(set(loader.get_template_cache), names)
@@ -0,0 +1,71 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core import writer
+from core.writer import Writer, WriteQueueFull
+from django.db import IntegrityError, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from posts.models import Group
+
+
+def create_group(slug):
+    return Group.objects.create(title=slug, slug=slug, description='')
+
+
+class WriterBatchTests(TestCase):
+    def test_queued_writes_committed_together(self):
+        """Записи из очереди выполняются одной транзакцией."""
+        queue_writer = Writer(batch_size=10)
+        futures = [
+            queue_writer.queue.put_nowait(item) or item[0]
+            for item in (
+                (Future(), create_group, (f'group-{i}',), {})
+                for i in range(15)
+            )
+        ]
+        self.assertEqual(queue_writer.run_batch(), 10)
+        self.assertEqual(queue_writer.run_batch(), 5)
+        self.assertEqual(queue_writer.commits, 2)
+        self.assertEqual(
+            [future.result().slug for future in futures],
+            [f'group-{i}' for i in range(15)],
+        )
+
+    def test_failed_write_does_not_cancel_batch(self):
+        """Ошибка одной записи достаётся только её вызову."""
+        create_group('taken')
+        queue_writer = Writer()
+        failed = Future()
+        created = Future()
+        queue_writer.queue.put_nowait((failed, create_group, ('taken',), {}))
+        queue_writer.queue.put_nowait((created, create_group, ('free',), {}))
+        queue_writer.run_batch()
+        self.assertIsInstance(failed.exception(), IntegrityError)
+        self.assertEqual(created.result().slug, 'free')
+        self.assertTrue(Group.objects.filter(slug='free').exists())
+
+    @override_settings(WRITE_QUEUE_TIMEOUT=0.01)
+    def test_full_queue_rejected(self):
+        """Переполненная очередь не принимает новые записи."""
+        queue_writer = Writer(size=1)
+        # Поток-писатель не запускаем, чтобы очередь не разбиралась.
+        queue_writer.thread = object()
+        queue_writer.submit(create_group, 'first')
+        with self.assertRaises(WriteQueueFull):
+            queue_writer.submit(create_group, 'second')
+
+
+@override_settings(WRITE_QUEUE_ENABLED=True)
+class WriterThreadTests(TransactionTestCase):
+    def test_concurrent_writes(self):
+        """Записи из многих потоков выполняет поток-писатель,
+        и каждая зафиксирована к возврату из ``write``.
+        """
+        def write(i):
+            try:
+                return writer.write(create_group, f'thread-{i}').pk
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            pks = list(executor.map(write, range(100)))
+        self.assertEqual(Group.objects.filter(pk__in=pks).count(), 100)
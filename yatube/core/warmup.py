@@ -0,0 +1,31 @@
+"""Прогрев кэша шаблонов при запуске сервера.
+
+С кэширующим загрузчиком каждый шаблон читается и разбирается один раз
+на процесс. Прогрев делает это до первого запроса, чтобы его цену
+не платили первые посетители каждого рабочего процесса.
+"""
+import os
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+
+def template_names(directory):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.html'):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_up_templates():
+    """Компилирует шаблоны из каталогов ``DIRS``, возвращает их число."""
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.engine.dirs:
+            for name in template_names(directory):
+                engine.get_template(name)
+                compiled += 1
+    return compiled
@@ -0,0 +1,135 @@
+"""Очередь записей в БД с одним потоком-писателем.
+
+SQLite допускает только одного писателя: при конкурентных запросах
+транзакции ждут блокировку и падают с «database is locked». Если
+включена настройка ``WRITE_QUEUE_ENABLED``, записи процесса передаются
+одному потоку. Он выполняет накопившиеся в очереди записи одной
+транзакцией (group commit), и ``write`` возвращает результат, только
+когда транзакция зафиксирована. Каждая запись идёт в своей точке
+сохранения, поэтому ошибка одной записи не отменяет остальные.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class WriteQueueFull(Exception):
+    """Очередь записей переполнена."""
+
+
+class Writer:
+    def __init__(self, using=DEFAULT_DB_ALIAS, size=None, batch_size=None):
+        self.using = using
+        self.queue = queue.Queue(size or settings.WRITE_QUEUE_SIZE)
+        self.batch_size = batch_size or settings.WRITE_QUEUE_BATCH_SIZE
+        self.commits = 0
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.loop, name='db-writer', daemon=True
+                )
+                self.thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        """Ставит запись в очередь и возвращает ``Future`` с её
+        результатом.
+        """
+        self.start()
+        future = Future()
+        try:
+            self.queue.put(
+                (future, func, args, kwargs),
+                timeout=settings.WRITE_QUEUE_TIMEOUT,
+            )
+        except queue.Full:
+            raise WriteQueueFull(
+                f'В очереди записей {self.queue.maxsize} задач'
+            ) from None
+        return future
+
+    def loop(self):
+        while True:
+            self.run_batch(block=True)
+
+    def take_batch(self, block):
+        batch = []
+        try:
+            batch.append(self.queue.get(block=block))
+            while len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def run_batch(self, block=False):
+        """Выполняет накопившиеся записи одной транзакцией."""
+        batch = self.take_batch(block)
+        if not batch:
+            return 0
+        close_old_connections()
+        done = []
+        try:
+            with transaction.atomic(using=self.using):
+                for future, func, args, kwargs in batch:
+                    if future.set_running_or_notify_cancel():
+                        done.append((future, *self.call(func, args, kwargs)))
+        except Exception as error:
+            logger.exception('Не удалось зафиксировать пачку записей')
+            for future, _, _ in done:
+                future.set_exception(error)
+            return 0
+        self.commits += 1
+        for future, result, error in done:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        return len(done)
+
+    def call(self, func, args, kwargs):
+        """Выполняет запись в точке сохранения, возвращает пару
+        (результат, ошибка).
+        """
+        try:
+            with transaction.atomic(using=self.using):
+                return func(*args, **kwargs), None
+        except Exception as error:
+            return None, error
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = Writer()
+    return _writer
+
+
+def write(func, *args, **kwargs):
+    """Выполняет запись ``func`` и возвращает её результат.
+
+    С включённой очередью запись выполняет поток-писатель, а вызов ждёт
+    фиксации транзакции. Внутри уже открытой транзакции запись
+    выполняется сразу: её данные должны быть видны этой транзакции.
+    """
+    if (
+        not settings.WRITE_QUEUE_ENABLED
+        or transaction.get_connection().in_atomic_block
+    ):
+        return func(*args, **kwargs)
+    return get_writer().submit(func, *args, **kwargs).result(
+        timeout=settings.WRITE_QUEUE_TIMEOUT
+    )
@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from django.conf import settings
+        from PIL import Image
+
+        from . import holes, signals  # noqa: F401
+
+        # Pillow откажется открывать изображения вдвое больше лимита
+        # ещё при чтении заголовка — и в форме, и в фоновой обработке.
+        Image.MAX_IMAGE_PIXELS = settings.POST_IMAGE_MAX_PIXELS
@@ -0,0 +1,245 @@
+"""Кэш страниц ленты с версионированными ключами.
+
+Версия ленты хранится в каждой закэшированной странице и меняется
+при любом изменении постов, групп, комментариев и подписок, поэтому
+TTL может быть большим.
+
+Страницы с одним адресом общие для всех пользователей: личные части
+страниц — дырки (см. ``core.holes``), они заполняются при каждом
+ответе.
+
+Защита от «набега» на БД при устаревании страницы:
+
+* перестраивает страницу ровно один запрос — тот, кто взял
+  блокировку ключа (single-flight);
+* остальные в это время получают устаревшую копию
+  (stale-while-revalidate);
+* срок жизни страницы вероятностно «истекает» чуть раньше
+  (XFetch), чтобы перестройка начиналась до массового промаха.
+"""
+import hashlib
+import math
+import random
+import time
+from datetime import datetime, timezone
+from functools import partial, wraps
+from http import HTTPStatus
+from uuid import uuid4
+
+from core.routers import reading_from_replica
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.views.decorators.http import condition
+
+FEED_VERSION_KEY = 'feed:version'
+STATS_KEY = 'feed:stats:{}'
+STATS = ('hit', 'miss', 'stale', 'early')
+WAIT_INTERVAL = 0.05
+
+
+def feed_version():
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        version = bump_feed_version()
+    return version
+
+
+def bump_feed_version():
+    # Случайная версия, а не счётчик: после вытеснения ключа счётчик
+    # начался бы заново и совпал с версией старых страниц. Время
+    # изменения нужно страницам, построенным по реплике.
+    version = f'{time.time()}:{uuid4().hex}'
+    cache.set(FEED_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_feeds(using=DEFAULT_DB_ALIAS):
+    """Меняет версию лент сейчас и после фиксации транзакции: иначе
+    параллельный запрос успел бы закэшировать страницу без ещё не
+    зафиксированной записи под уже новой версией.
+    """
+    bump_feed_version()
+    transaction.on_commit(bump_feed_version, using=using)
+
+
+def version_time(version):
+    try:
+        return float(version.partition(':')[0])
+    except ValueError:
+        return 0.0
+
+
+def feed_cache_key(request, per_user=False):
+    """Ключ страницы. Скелет страницы с дырками общий для всех
+    пользователей; лента, которая сама зависит от пользователя,
+    кэшируется для каждого отдельно.
+    """
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    owner = (request.user.pk or 0) if per_user else 'all'
+    return f'feed:page:{owner}:{path}'
+
+
+def replicas_settled(version):
+    """Прошло ли после изменения данных время, за которое его
+    получают реплики.
+    """
+    return (
+        not settings.DATABASE_REPLICAS
+        or time.time() >= version_time(version) + settings.REPLICA_LAG
+    )
+
+
+def feed_etag(request, *args, **kwargs):
+    """ETag страницы ленты для ``condition``: меняется вместе
+    с версией ленты и различается по адресам, пользователям и CSRF-
+    cookie — от них зависят дырки страницы.
+
+    Пока реплики могут отставать, страница могла быть построена
+    по старым данным, и ETag не выдаётся.
+    """
+    version = feed_version()
+    if not replicas_settled(version):
+        return None
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    key = f'{version}:{csrf}:{feed_cache_key(request, per_user=True)}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def feed_last_modified(request, *args, **kwargs):
+    """Время последнего изменения данных лент для ``condition``."""
+    version = feed_version()
+    changed = version_time(version)
+    if changed and replicas_settled(version):
+        return datetime.fromtimestamp(changed, tz=timezone.utc)
+    return None
+
+
+# Условный GET для страниц лент и постов: неизменившаяся страница
+# отдаётся как 304 после одного чтения версии из кэша.
+feed_condition = condition(
+    etag_func=feed_etag, last_modified_func=feed_last_modified
+)
+
+
+def count(stat):
+    key = STATS_KEY.format(stat)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def feed_cache_stats():
+    """Счётчики попаданий, промахов и отданных устаревших страниц."""
+    values = cache.get_many([STATS_KEY.format(stat) for stat in STATS])
+    return {
+        stat: values.get(STATS_KEY.format(stat), 0) for stat in STATS
+    }
+
+
+def reset_feed_cache_stats():
+    cache.delete_many([STATS_KEY.format(stat) for stat in STATS])
+
+
+def expires_early(expires, delta, now, rand):
+    """XFetch: чем дольше перестройка, тем раньше её начинаем."""
+    beta = settings.FEED_CACHE_EARLY_BETA
+    return now - delta * beta * math.log(rand) >= expires
+
+
+def cache_feed(view=None, per_user=False):
+    """Кэширует страницу ленты до следующего изменения данных.
+
+    ``per_user`` — страница строится по данным пользователя (лента
+    подписок) и кэшируется для каждого отдельно.
+    """
+    if view is None:
+        return partial(cache_feed, per_user=per_user)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        key = feed_cache_key(request, per_user)
+        version = feed_version()
+        entry = usable(cache.get(key))
+        response = fresh_response(entry, version)
+        if response is not None:
+            return response
+
+        lock_key = f'{key}:lock'
+        locked = cache.add(lock_key, 1, settings.FEED_CACHE_LOCK_TIMEOUT)
+        if not locked:
+            # Страницу уже перестраивает другой запрос.
+            if entry is not None:
+                count('stale')
+                return entry['response']
+            entry = usable(wait_for(key))
+            if entry is not None:
+                count('hit')
+                return entry['response']
+
+        count('miss')
+        try:
+            started = time.time()
+            response = view(request, *args, **kwargs)
+            if response.status_code == HTTPStatus.OK:
+                store(key, version, response, started)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return response
+    return wrapper
+
+
+def store(key, version, response, started):
+    finished = time.time()
+    expires = finished + settings.FEED_CACHE_TIMEOUT
+    if reading_from_replica():
+        # Реплика могла ещё не получить последнее изменение.
+        expires = min(expires, version_time(version) + settings.REPLICA_LAG)
+    cache.set(key, {
+        'version': version,
+        'replica': reading_from_replica(),
+        'response': response,
+        'expires': expires,
+        'delta': finished - started,
+    }, settings.FEED_CACHE_TIMEOUT + settings.FEED_CACHE_STALE)
+
+
+def usable(entry):
+    """Запись кэша, если её можно отдать текущему запросу: страница,
+    построенная по реплике, не годится тому, кто после записи читает
+    основную БД.
+    """
+    if entry is None or (entry['replica'] and not reading_from_replica()):
+        return None
+    return entry
+
+
+def fresh_response(entry, version):
+    """Ответ из записи кэша, если его ещё не пора перестраивать."""
+    if entry is None or entry['version'] != version:
+        return None
+    now = time.time()
+    if not expires_early(
+        entry['expires'], entry['delta'], now, random.random() or 1.0
+    ):
+        count('hit')
+        return entry['response']
+    if now < entry['expires']:
+        count('early')
+    return None
+
+
+def wait_for(key):
+    """Ждёт, пока страницу построит запрос, взявший блокировку."""
+    deadline = time.time() + settings.FEED_CACHE_LOCK_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
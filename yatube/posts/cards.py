@@ -0,0 +1,40 @@
+"""Кэш отрисованных карточек постов.
+
+Карточка (``posts/includes/post.html``) меняется только вместе с постом,
+поэтому в ключ входит ``Post.updated``: правка поста даёт новый ключ.
+Карточки страницы ленты читаются из кэша одним ``get_many``,
+отрисовываются только недостающие.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import thumbnails
+
+CARD_KEY = 'post:card:{}:{}'
+CARD_TEMPLATE = 'posts/includes/post.html'
+
+
+def card_key(post):
+    return CARD_KEY.format(post.pk, post.updated.timestamp())
+
+
+def attach_cards(posts):
+    """Проставляет постам ``card`` — HTML карточки."""
+    keys = {card_key(post): post for post in posts}
+    cards = cache.get_many(list(keys))
+    missing = [post for key, post in keys.items() if key not in cards]
+    thumbnails.resolve_thumbnails(missing)
+    rendered = {
+        card_key(post): render_to_string(CARD_TEMPLATE, {'post': post})
+        for post in missing
+    }
+    cache.set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
+    cards.update(rendered)
+    for key, post in keys.items():
+        post.card = mark_safe(cards[key])
+
+
+def forget_card(post):
+    cache.delete(card_key(post))
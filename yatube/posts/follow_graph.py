@@ -0,0 +1,193 @@
+"""Граф подписок.
+
+ID авторов, на которых подписан пользователь, хранятся в кэше одним
+значением: отсортированным массивом ``array('q')`` — 8 байт на
+подписку вместо объекта Python на строку. Проверка подписки — двоичный
+поиск по массиву без обращения к БД.
+
+Кэш сбрасывается при каждой записи: сигналами для одиночных подписок
+и явно в ``follow_many`` и ``unfollow_many``. Чтобы сбросить кэш
+всех пользователей (после загрузки данных в обход сигналов), меняется
+поколение, записанное в каждом значении.
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import stats, timeline
+from .cache import invalidate_feeds
+from .models import Follow, Recommendation
+from .stats import followers_count  # noqa: F401
+from .transfer import chunks
+
+FOLLOWEES_KEY = 'follow:followees:{}:{}'
+GENERATION_KEY = 'follow:generation'
+FOLLOWEES_TIMEOUT = 60 * 60 * 24
+BATCH_SIZE = 1000
+# SQLite принимает не больше 999 параметров в запросе.
+DELETE_BATCH_SIZE = 500
+
+
+def followees_key(user_id, using):
+    return FOLLOWEES_KEY.format(using, user_id)
+
+
+def followee_ids(user_id, using=DEFAULT_DB_ALIAS):
+    """Отсортированный массив ID авторов, на которых подписан
+    пользователь.
+    """
+    key = followees_key(user_id, using)
+    values = cache.get_many([GENERATION_KEY, key])
+    generation = values.get(GENERATION_KEY, 0)
+    cached = values.get(key)
+    if cached is not None and cached[0] == generation:
+        ids = array('q')
+        ids.frombytes(cached[1])
+        return ids
+    ids = array('q', Follow.objects.using(using).filter(
+        user_id=user_id
+    ).order_by('author_id').values_list('author_id', flat=True))
+    cache.set(key, (generation, ids.tobytes()), FOLLOWEES_TIMEOUT)
+    return ids
+
+
+def is_following(user_id, author_id, using=DEFAULT_DB_ALIAS):
+    ids = followee_ids(user_id, using)
+    index = bisect_left(ids, author_id)
+    return index < len(ids) and ids[index] == author_id
+
+
+def forget(user_ids, using=DEFAULT_DB_ALIAS):
+    """Сбрасывает кэш подписок пользователей сейчас и после фиксации
+    транзакции: иначе параллельный запрос успел бы закэшировать
+    ещё не зафиксированное состояние.
+    """
+    keys = [followees_key(user_id, using) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(partial(cache.delete_many, keys), using=using)
+
+
+def forget_all():
+    """Сбрасывает кэш подписок всех пользователей."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def follow(user_id, author_id):
+    """Подписывает пользователя на автора; ``True``, если подписки
+    ещё не было.
+    """
+    if user_id == author_id:
+        return False
+    _, created = Follow.objects.get_or_create(
+        user_id=user_id, author_id=author_id
+    )
+    return created
+
+
+def unfollow(user_id, author_id):
+    """Отписывает пользователя от автора; ``True``, если подписка
+    была.
+    """
+    deleted, _ = Follow.objects.filter(
+        user_id=user_id, author_id=author_id
+    ).delete()
+    return bool(deleted)
+
+
+def existing_pairs(pairs):
+    """Те из пар (пользователь, автор), что уже есть в БД."""
+    by_user = defaultdict(set)
+    for user_id, author_id in pairs:
+        by_user[user_id].add(author_id)
+    found = set()
+    for user_ids in chunks(by_user, BATCH_SIZE):
+        rows = Follow.objects.filter(user_id__in=user_ids).values_list(
+            'user_id', 'author_id'
+        )
+        found.update(
+            (user_id, author_id) for user_id, author_id in rows.iterator()
+            if author_id in by_user[user_id]
+        )
+    return found
+
+
+def apply_changes(pairs, sign):
+    """Счётчики, ленты и кэши после массовой подписки (``sign=1``)
+    или отписки (``sign=-1``).
+    """
+    followers = Counter(author_id for _, author_id in pairs)
+    following = Counter(user_id for user_id, _ in pairs)
+    for author_id, count in followers.items():
+        stats.change_author_stats(author_id, followers_count=sign * count)
+    for user_id, count in following.items():
+        stats.change_author_stats(user_id, following_count=sign * count)
+    by_author = defaultdict(list)
+    for user_id, author_id in pairs:
+        by_author[author_id].append(user_id)
+    for author_id, user_ids in by_author.items():
+        if sign > 0:
+            timeline.on_follow_many(user_ids, author_id)
+            # Новые подписки больше не рекомендуются.
+            Recommendation.objects.filter(
+                user_id__in=user_ids, author_id=author_id
+            ).delete()
+        else:
+            timeline.on_unfollow_many(user_ids, author_id)
+    forget(following)
+    invalidate_feeds()
+
+
+@transaction.atomic
+def follow_many(pairs):
+    """Массовая подписка, например при загрузке данных.
+
+    Пары (пользователь, автор) сохраняются через ``bulk_create`` без
+    сигналов; подписки на себя и уже существующие пропускаются.
+    Счётчики и ленты обновляются один раз на автора. Возвращает число
+    новых подписок.
+    """
+    pairs = {
+        (user_id, author_id) for user_id, author_id in pairs
+        if user_id != author_id
+    }
+    new = pairs - existing_pairs(pairs)
+    Follow.objects.bulk_create(
+        (Follow(user_id=user_id, author_id=author_id)
+         for user_id, author_id in new),
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    if new:
+        apply_changes(new, 1)
+    return len(new)
+
+
+@transaction.atomic
+def unfollow_many(pairs):
+    """Массовая отписка; возвращает число удалённых подписок."""
+    removed = existing_pairs(set(pairs))
+    by_user = defaultdict(list)
+    for user_id, author_id in removed:
+        by_user[user_id].append(author_id)
+    # Удаление без сигналов: их работу делает apply_changes.
+    sql = (
+        f'DELETE FROM {Follow._meta.db_table} '
+        'WHERE user_id = %s AND author_id IN ({})'
+    )
+    with connections[Follow.objects.db].cursor() as cursor:
+        for user_id, author_ids in by_user.items():
+            for chunk in chunks(author_ids, DELETE_BATCH_SIZE):
+                cursor.execute(
+                    sql.format(', '.join(['%s'] * len(chunk))),
+                    [user_id, *chunk],
+                )
+    if removed:
+        apply_changes(removed, -1)
+    return len(removed)
@@ -1,6 +1,8 @@
 from xml.etree.ElementTree import Comment
 
-from django.forms import ModelForm
+from django.conf import settings
+from django.forms import ModelForm, ValidationError
+from django.template.defaultfilters import filesizeformat
 
 from .models import Comment, Post
 
@@ -12,6 +14,31 @@ class PostForm(ModelForm):
         help_texts = {'text': 'Введите сообщение', 'group': 'Выберите группу'}
         labels = {'text': 'Текст сообщения', 'group': 'Группа'}
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        # ImageField уже прочитал заголовок нового файла, не декодируя
+        # само изображение; у сохранённого файла атрибута нет.
+        header = getattr(image, 'image', None)
+        if header is None:
+            return image
+        if image.size > settings.POST_IMAGE_MAX_SIZE:
+            raise ValidationError(
+                'Файл больше %s.'
+                % filesizeformat(settings.POST_IMAGE_MAX_SIZE)
+            )
+        if header.format not in settings.POST_IMAGE_FORMATS:
+            raise ValidationError(
+                'Поддерживаются форматы: %s.'
+                % ', '.join(settings.POST_IMAGE_FORMATS)
+            )
+        width, height = header.size
+        if width * height > settings.POST_IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                'Изображение слишком большое: %s×%s пикселей.'
+                % (width, height)
+            )
+        return image
+
 
 class CommentForm(ModelForm):
     class Meta:
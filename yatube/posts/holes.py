@@ -0,0 +1,30 @@
+"""Дырки страниц постов: части, зависящие от пользователя."""
+from core.holes import register
+
+from . import follow_graph
+from .forms import CommentForm
+
+
+@register('feed_switcher', 'posts/includes/switcher.html')
+def feed_switcher(request, active):
+    return {'active': active}
+
+
+@register('follow_button', 'posts/includes/follow_button.html')
+def follow_button(request, author, author_id):
+    user = request.user
+    author_id = int(author_id)
+    if not user.is_authenticated or user.pk == author_id:
+        return {'author': author, 'show': False}
+    following = follow_graph.is_following(user.pk, author_id)
+    return {'author': author, 'show': True, 'following': following}
+
+
+@register('post_edit', 'posts/includes/post_edit.html')
+def post_edit(request, post_id, author):
+    return {'post_id': post_id, 'author': author}
+
+
+@register('comment_form', 'posts/includes/comment.html')
+def comment_form(request, post_id):
+    return {'post_id': post_id, 'form': CommentForm()}
@@ -0,0 +1,43 @@
+"""Фоновая обработка загруженных изображений постов.
+
+Слишком большие исходники уменьшаются и перекодируются, после чего
+создаются адаптивные варианты и миниатюры. Всё это выполняется в пуле
+``core.tasks``, число потоков которого ограничивает и память, занятую
+декодированием.
+"""
+from core import tasks
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from . import thumbnails, variants
+
+JPEG_QUALITY = 90
+
+
+def shrink_original(name):
+    """Уменьшает исходное изображение до ``POST_IMAGE_MAX_SIDE``
+    по длинной стороне. Возвращает ``True``, если файл изменён.
+    """
+    limit = settings.POST_IMAGE_MAX_SIDE
+    with default_storage.open(name) as file, Image.open(file) as image:
+        if max(image.size) <= limit:
+            return False
+        image_format = image.format
+        # JPEG декодируется сразу в уменьшенном масштабе.
+        image.draft(image.mode, (limit, limit))
+        image.thumbnail((limit, limit))
+    options = {'quality': JPEG_QUALITY} if image_format == 'JPEG' else {}
+    with default_storage.open(name, 'wb') as file:
+        image.save(file, image_format, **options)
+    return True
+
+
+def process_upload(name):
+    shrink_original(name)
+    variants.generate_variants(name)
+    thumbnails.generate_thumbnails(name)
+
+
+def process_upload_later(name):
+    tasks.submit(process_upload, name)
@@ -0,0 +1,43 @@
+"""Хранилище метаданных миниатюр sorl с пакетным чтением.
+
+Как и стандартное ``cached_db_kvstore``, хранит значения в общем кэше
+и в БД, но умеет читать сразу несколько ключей: одним ``get_many``
+из кэша и одним запросом к БД для промахов.
+"""
+from sorl.thumbnail.conf import settings
+from sorl.thumbnail.images import deserialize_image_file
+from sorl.thumbnail.kvstores import cached_db_kvstore
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.models import KVStore as KVStoreModel
+
+EMPTY_VALUE = cached_db_kvstore.EMPTY_VALUE
+
+
+class KVStore(cached_db_kvstore.KVStore):
+    def get_many(self, image_files):
+        """Найденные в хранилище файлы в виде ``{ключ: ImageFile}``."""
+        keys = {add_prefix(image_file.key): image_file.key
+                for image_file in image_files}
+        return {
+            keys[raw_key]: deserialize_image_file(value)
+            for raw_key, value in self._get_many_raw(list(keys)).items()
+        }
+
+    def _get_many_raw(self, keys):
+        if not keys:
+            return {}
+        values = self.cache.get_many(keys)
+        missing = [key for key in keys if key not in values]
+        if missing:
+            found = dict(KVStoreModel.objects.filter(
+                key__in=missing
+            ).values_list('key', 'value'))
+            # Отсутствующие ключи тоже кэшируем, чтобы не спрашивать БД
+            # на каждой странице.
+            fetched = {key: found.get(key, EMPTY_VALUE) for key in missing}
+            self.cache.set_many(fetched, settings.THUMBNAIL_CACHE_TIMEOUT)
+            values.update(fetched)
+        return {
+            key: value for key, value in values.items()
+            if value != EMPTY_VALUE
+        }
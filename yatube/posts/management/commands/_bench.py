@@ -0,0 +1,80 @@
+"""Общее для команд-бенчмарков: временная БД SQLite и загрузка данных."""
+import contextlib
+import os
+import random
+import tempfile
+import timeit
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.utils import timezone
+from posts.models import Group, Post, User
+
+ALIAS = 'bench'
+BATCH_SIZE = 10000
+
+
+@contextlib.contextmanager
+def bench_database(directory=None):
+    """Подключает пустую временную БД SQLite под псевдонимом ``bench``."""
+    handle, path = tempfile.mkstemp(suffix='.sqlite3', dir=directory)
+    os.close(handle)
+    connections.databases[ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+    }
+    try:
+        call_command('migrate', database=ALIAS, verbosity=0)
+        yield ALIAS
+    finally:
+        connections[ALIAS].close()
+        if hasattr(connections._connections, ALIAS):
+            delattr(connections._connections, ALIAS)
+        del connections.databases[ALIAS]
+        os.remove(path)
+
+
+def seed(alias, posts, authors=1000, groups=50, stdout=None):
+    """Загружает посты напрямую через executemany, в обход сигналов."""
+    connection = connections[alias]
+    now = timezone.now()
+    User.objects.using(alias).bulk_create(
+        User(username=f'bench_{i}', date_joined=now)
+        for i in range(authors)
+    )
+    Group.objects.using(alias).bulk_create(
+        Group(title=f'Группа {i}', slug=f'bench-{i}', description='')
+        for i in range(groups)
+    )
+    author_ids = list(User.objects.using(alias).values_list('pk', flat=True))
+    group_ids = list(Group.objects.using(alias).values_list('pk', flat=True))
+    table = Post._meta.db_table
+    sql = (
+        f'INSERT INTO {table} '
+        '(text, pub_date, updated, author_id, group_id, image, '
+        'image_variants, comments_count) '
+        "VALUES (%s, %s, %s, %s, %s, '', '', 0)"
+    )
+    rnd = random.Random(0)
+    adapt = connection.ops.adapt_datetimefield_value
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        for start in range(0, posts, BATCH_SIZE):
+            cursor.executemany(sql, [
+                (
+                    f'Текст поста {i}',
+                    adapt(now - timedelta(seconds=posts - i)),
+                    adapt(now),
+                    rnd.choice(author_ids),
+                    rnd.choice(group_ids) if i % 3 else None,
+                )
+                for i in range(start, min(start + BATCH_SIZE, posts))
+            ])
+            if stdout is not None and start % (BATCH_SIZE * 50) == 0:
+                stdout.write(f'  загружено {start} постов')
+    return author_ids, group_ids
+
+
+def best_time(func, repeat):
+    """Лучшее время одного вызова в миллисекундах."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
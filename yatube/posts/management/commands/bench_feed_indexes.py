@@ -0,0 +1,115 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+from posts.models import Follow, Post, TimelineEntry
+from posts.views import NUMBER_OF_POSTS
+
+from ._bench import bench_database, best_time, seed
+
+FOLLOWED_AUTHORS = 200
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты во временную БД SQLite и сравнивает планы '
+        '(EXPLAIN QUERY PLAN) и время лент без индексов лент и с ними.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--tmpdir', help='Каталог для временной БД.'
+        )
+
+    def handle(self, *args, **options):
+        with bench_database(options['tmpdir']) as alias:
+            self.stdout.write(f'Загружаем {options["posts"]} постов...')
+            author_ids, group_ids = seed(
+                alias, options['posts'], stdout=self.stdout
+            )
+            reader_id = author_ids[0]
+            self.follow(alias, reader_id, author_ids[1:FOLLOWED_AUTHORS + 1])
+            posts = Post.objects.using(alias).for_feed()
+            followed = Follow.objects.using(alias).filter(user_id=reader_id)
+            feeds = {
+                'index': posts,
+                'group_list': posts.filter(group_id=group_ids[0]),
+                'profile': posts.filter(author_id=author_ids[0]),
+                # Чтение постов популярных авторов без раскладки.
+                'follow_read': posts.filter(
+                    author_id__in=followed.values('author_id')
+                ),
+            }
+            feeds = {
+                name: queryset.order_by('-pub_date', '-id')
+                for name, queryset in feeds.items()
+            }
+            # Материализованная лента подписок читается по записям ленты
+            # (см. posts.timeline.TimelinePaginator).
+            feeds['follow_index'] = posts.filter(
+                timeline_entries__user_id=reader_id
+            ).order_by(
+                '-timeline_entries__pub_date', '-timeline_entries__post__id'
+            )
+
+            self.toggle_indexes(alias, add=False)
+            self.stdout.write(self.style.MIGRATE_HEADING('Без индексов'))
+            before = self.measure(feeds, options['repeat'])
+            self.toggle_indexes(alias, add=True)
+            self.stdout.write(self.style.MIGRATE_HEADING('С индексами'))
+            after = self.measure(feeds, options['repeat'])
+
+            self.stdout.write(self.style.MIGRATE_HEADING('Итого, мс'))
+            for name in feeds:
+                self.stdout.write(
+                    f'{name:<14}{before[name]:>10.2f}{after[name]:>10.2f}'
+                )
+
+    def follow(self, alias, reader_id, author_ids):
+        Follow.objects.using(alias).bulk_create(
+            Follow(user_id=reader_id, author_id=author_id)
+            for author_id in author_ids
+        )
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {TimelineEntry._meta.db_table} '
+                '(user_id, post_id, pub_date) '
+                f'SELECT %s, id, pub_date FROM {Post._meta.db_table} '
+                f'WHERE author_id IN ({", ".join(["%s"] * len(author_ids))})',
+                [reader_id, *author_ids]
+            )
+
+    def toggle_indexes(self, alias, add):
+        connection = connections[alias]
+        with connection.schema_editor() as editor:
+            for index in Post._meta.indexes:
+                if add:
+                    editor.add_index(Post, index)
+                else:
+                    editor.remove_index(Post, index)
+            for index in TimelineEntry._meta.indexes:
+                if add:
+                    editor.add_index(TimelineEntry, index)
+                else:
+                    editor.remove_index(TimelineEntry, index)
+            for constraint in Follow._meta.constraints:
+                if add:
+                    editor.add_constraint(Follow, constraint)
+                else:
+                    editor.remove_constraint(Follow, constraint)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def measure(self, feeds, repeat):
+        timings = {}
+        for name, queryset in feeds.items():
+            # Первая страница курсорной пажинации: на строку больше.
+            first_page = queryset[:NUMBER_OF_POSTS + 1]
+            self.stdout.write(f'{name}:')
+            for line in first_page.explain().splitlines():
+                self.stdout.write(f'    {line}')
+            timings[name] = best_time(
+                lambda: list(first_page.all()), repeat
+            )
+            self.stdout.write(f'    первая страница: {timings[name]:.2f} мс')
+        return timings
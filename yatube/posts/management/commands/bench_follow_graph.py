@@ -0,0 +1,91 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from posts import follow_graph
+from posts.management.commands._bench import (BATCH_SIZE, bench_database,
+                                              best_time, seed)
+from posts.models import Follow
+
+SAMPLE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает подписки во временную БД SQLite и сравнивает проверку '
+        'подписки и выборку подписок пользователя запросом к БД и через '
+        'кэш графа подписок (posts.follow_graph).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--edges', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--tmpdir', help='Каталог для временной БД.'
+        )
+
+    def handle(self, *args, **options):
+        with bench_database(options['tmpdir']) as alias:
+            user_ids, _ = seed(alias, 0, authors=options['users'])
+            self.stdout.write(f'Загружаем {options["edges"]} подписок...')
+            pairs = self.seed_follows(alias, user_ids, options['edges'])
+            rnd = random.Random(1)
+            sample = rnd.sample(pairs, SAMPLE)
+            follows = Follow.objects.using(alias)
+            try:
+                self.report('is_following', options['repeat'], {
+                    'БД': lambda: [
+                        follows.filter(
+                            user_id=user_id, author_id=author_id
+                        ).exists()
+                        for user_id, author_id in sample
+                    ],
+                    'кэш': lambda: [
+                        follow_graph.is_following(user_id, author_id, alias)
+                        for user_id, author_id in sample
+                    ],
+                })
+                self.report('followee_ids', options['repeat'], {
+                    'БД': lambda: [
+                        list(follows.filter(user_id=user_id).values_list(
+                            'author_id', flat=True
+                        ))
+                        for user_id, _ in sample
+                    ],
+                    'кэш': lambda: [
+                        follow_graph.followee_ids(user_id, alias)
+                        for user_id, _ in sample
+                    ],
+                })
+            finally:
+                follow_graph.forget(
+                    [user_id for user_id, _ in sample], alias
+                )
+
+    def seed_follows(self, alias, user_ids, edges):
+        """Случайные подписки, примерно поровну на пользователя."""
+        rnd = random.Random(0)
+        per_user = min(edges // len(user_ids), len(user_ids) - 1)
+        pairs = [
+            (user_id, author_id)
+            for user_id in user_ids
+            for author_id in rnd.sample(user_ids, per_user + 1)
+            if author_id != user_id
+        ][:edges]
+        table = Follow._meta.db_table
+        sql = f'INSERT INTO {table} (user_id, author_id) VALUES (%s, %s)'
+        connection = connections[alias]
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            for start in range(0, len(pairs), BATCH_SIZE):
+                cursor.executemany(sql, pairs[start:start + BATCH_SIZE])
+        return pairs
+
+    def report(self, name, repeat, variants):
+        self.stdout.write(f'{name}, {SAMPLE} вызовов:')
+        for variant, func in variants.items():
+            # Первый вызов заполняет кэш.
+            func()
+            self.stdout.write(
+                f'  {variant:<6}{best_time(func, repeat):>10.2f} мс'
+            )
@@ -0,0 +1,69 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from posts.models import Post, User
+from posts.paginators import CursorPaginator
+from posts.views import NUMBER_OF_POSTS
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время OFFSET- и курсорной пажинации первой и глубокой '
+        'страницы ленты. Данные создаются во временной транзакции '
+        'и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=10000,
+            help='Номер глубокой страницы (постов создаётся pages * 10).'
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        repeat = options['repeat']
+        with transaction.atomic():
+            self.seed(pages * NUMBER_OF_POSTS)
+            posts = Post.objects.select_related('author', 'group')
+            deep_cursor = CursorPaginator(
+                posts, NUMBER_OF_POSTS
+            ).get_page(pages - 1).next_cursor
+            cases = (
+                ('offset', 1, lambda: self.offset_page(posts, 1)),
+                ('offset', pages, lambda: self.offset_page(posts, pages)),
+                ('cursor', 1, lambda: self.cursor_page(posts, None)),
+                (
+                    'cursor', pages,
+                    lambda: self.cursor_page(posts, deep_cursor)
+                ),
+            )
+            for name, number, case in cases:
+                best = min(timeit.repeat(case, number=1, repeat=repeat))
+                self.stdout.write(
+                    f'{name:<8}страница {number:>7}: {best * 1000:8.2f} мс'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, total):
+        self.stdout.write(f'Создаём {total} постов...')
+        author = User.objects.create_user(username='bench_pagination')
+        for start in range(0, total, BATCH_SIZE):
+            Post.objects.bulk_create(
+                Post(author=author, text=f'Пост {i}')
+                for i in range(start, min(start + BATCH_SIZE, total))
+            )
+
+    @staticmethod
+    def offset_page(posts, number):
+        return list(Paginator(posts, NUMBER_OF_POSTS).page(number))
+
+    @staticmethod
+    def cursor_page(posts, cursor):
+        return list(
+            CursorPaginator(posts, NUMBER_OF_POSTS).get_cursor_page(cursor)
+        )
@@ -0,0 +1,107 @@
+import copy
+import timeit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from posts.cards import CARD_TEMPLATE
+from posts.models import AuthorStats, Group, Post, User
+from posts.views import NUMBER_OF_POSTS
+
+LOADERS = {
+    'без кэша': [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ],
+    'кэширующий': [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время отрисовки страниц лент (карточки постов '
+        'и сама страница) без кэша шаблонов и с кэширующим загрузчиком. '
+        'БД не используется: посты создаются в памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        feeds = self.feeds()
+        timings = {}
+        for loader, loaders in LOADERS.items():
+            backend = self.backend(loaders)
+            for name, (template_name, context) in feeds.items():
+                timings[name, loader] = self.measure(
+                    backend, template_name, context,
+                    options['number'], options['repeat']
+                )
+        self.stdout.write(
+            f'{"страница":<12}' + ''.join(f'{name:>14}' for name in LOADERS)
+        )
+        for name in feeds:
+            self.stdout.write(f'{name:<12}' + ''.join(
+                f'{timings[name, loader]:>11.2f} мс' for loader in LOADERS
+            ))
+
+    def backend(self, loaders):
+        params = copy.deepcopy(settings.TEMPLATES[0])
+        params.pop('BACKEND')
+        params['NAME'] = 'bench'
+        params['APP_DIRS'] = False
+        params['OPTIONS']['loaders'] = loaders
+        return DjangoTemplates(params)
+
+    def feeds(self):
+        now = timezone.now()
+        author = User(
+            id=1, username='bench', first_name='Имя', last_name='Фамилия'
+        )
+        author.stats = AuthorStats(user=author, posts_count=NUMBER_OF_POSTS)
+        group = Group(id=1, title='Группа', slug='bench', description='')
+        posts = [
+            Post(
+                id=i, text=f'Текст поста {i} ' * 20, pub_date=now,
+                updated=now, author=author, group=group,
+            )
+            for i in range(1, NUMBER_OF_POSTS + 1)
+        ]
+        page_obj = Paginator(posts, NUMBER_OF_POSTS).page(1)
+        return {
+            'index': ('posts/index.html', {'page_obj': page_obj}),
+            'group_list': (
+                'posts/group_list.html',
+                {'group': group, 'page_obj': page_obj}
+            ),
+            'profile': (
+                'posts/profile.html',
+                {'author': author, 'page_obj': page_obj}
+            ),
+            'follow': ('posts/follow.html', {'page_obj': page_obj}),
+        }
+
+    def measure(self, backend, template_name, context, number, repeat):
+        """Среднее время страницы, у которой нет карточек в кэше."""
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+
+        def render():
+            card = backend.get_template(CARD_TEMPLATE)
+            for post in context['page_obj']:
+                post.card = mark_safe(card.render({'post': post}))
+            backend.get_template(template_name).render(context, request)
+
+        best = min(timeit.repeat(render, number=number, repeat=repeat))
+        return best / number * 1000
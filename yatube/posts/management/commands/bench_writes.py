@@ -0,0 +1,89 @@
+import threading
+import time
+
+from core.writer import Writer
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+from posts.models import Comment, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест записи: потоки одновременно добавляют '
+        'комментарии напрямую и через очередь записей (core.writer). '
+        'Работает с БД по умолчанию, созданные данные удаляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=200)
+        parser.add_argument(
+            '--writes', type=int, default=5,
+            help='Сколько комментариев добавляет каждый поток.'
+        )
+        parser.add_argument(
+            '--timeout', type=float,
+            help='Время ожидания блокировки SQLite в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        if options['timeout'] is not None:
+            connections.databases['default'].setdefault('OPTIONS', {})[
+                'timeout'
+            ] = options['timeout']
+        author = User.objects.create_user(username='bench_writes')
+        post = Post.objects.create(author=author, text='Нагрузочный тест')
+        total = options['writers'] * options['writes']
+        queue_writer = Writer(size=total)
+        modes = {
+            'напрямую': lambda func: func(),
+            'очередь': lambda func: queue_writer.submit(func).result(),
+        }
+        self.stdout.write(
+            f'{options["writers"]} потоков, {total} записей'
+        )
+        try:
+            for name, write in modes.items():
+                commits = queue_writer.commits
+                ok, errors, elapsed = self.run_writers(
+                    write, post, options['writers'], options['writes']
+                )
+                self.stdout.write(
+                    f'{name:<10}записано {ok:>6}, ошибок {errors:>6}, '
+                    f'{elapsed:7.2f} с, {ok / elapsed:8.0f} записей/с, '
+                    f'транзакций очереди {queue_writer.commits - commits}'
+                )
+        finally:
+            author.delete()
+
+    def run_writers(self, write, post, writers, writes):
+        barrier = threading.Barrier(writers + 1)
+        results = []
+
+        def writer():
+            ok = errors = 0
+            barrier.wait()
+            for _ in range(writes):
+                comment = Comment(
+                    post=post, author=post.author, text='Комментарий'
+                )
+                try:
+                    write(comment.save)
+                    ok += 1
+                except DatabaseError:
+                    errors += 1
+            results.append((ok, errors))
+            connections.close_all()
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return (
+            sum(ok for ok, _ in results),
+            sum(errors for _, errors in results),
+            elapsed,
+        )
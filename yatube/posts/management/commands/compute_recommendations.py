@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from posts.cache import bump_feed_version
+from posts.recommendations import (ROWS_PER_BLOCK, TOP_N,
+                                   compute_recommendations)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации «на кого подписаться» по графу '
+        'подписок (друзья друзей, разреженные матрицы numpy/scipy).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=TOP_N,
+            help='Сколько авторов рекомендовать каждому пользователю.'
+        )
+        parser.add_argument(
+            '--rows-per-block', type=int, default=ROWS_PER_BLOCK,
+            help='Сколько пользователей считать за один шаг.'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        created = compute_recommendations(
+            options['top'], options['rows_per_block'], options['database']
+        )
+        if options['database'] == DEFAULT_DB_ALIAS:
+            bump_feed_version()
+        self.stdout.write(
+            f'Рекомендаций: {created} за {time.monotonic() - started:.1f} с'
+        )
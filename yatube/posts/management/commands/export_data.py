@@ -0,0 +1,66 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from posts.transfer import (FIELDS, FORMATS, MODELS, Checkpoint, Progress,
+                            RowWriter, chunks, export_rows, guess_format)
+
+
+class Command(BaseCommand):
+    help = (
+        'Построчно выгружает группы, посты, комментарии или подписки '
+        'в NDJSON или CSV. С --checkpoint прерванная выгрузка '
+        'продолжается при повторном запуске.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument(
+            'output', help='Файл выгрузки или «-» для stdout.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='По умолчанию по расширению файла (.csv или NDJSON).'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--checkpoint', help='Файл контрольной точки.')
+
+    def handle(self, *args, **options):
+        name = options['model']
+        path = options['output']
+        data_format = options['format'] or guess_format(path)
+        if path == '-':
+            if options['checkpoint']:
+                raise CommandError('Выгрузку в stdout нельзя продолжить.')
+            self.export(sys.stdout, name, data_format, options, None)
+            return
+        checkpoint = Checkpoint(
+            options['checkpoint'], f'export:{name}:{path}'
+        )
+        if checkpoint.rows:
+            # Дописанное после контрольной точки отбрасывается.
+            file = open(path, 'r+', encoding='utf-8', newline='')
+            file.truncate(checkpoint.data['offset'])
+            file.seek(checkpoint.data['offset'])
+        else:
+            file = open(path, 'w', encoding='utf-8', newline='')
+        with file:
+            self.export(file, name, data_format, options, checkpoint)
+        checkpoint.clear()
+
+    def export(self, file, name, data_format, options, checkpoint):
+        done = checkpoint.rows if checkpoint else 0
+        last_id = checkpoint.data.get('last_id', 0) if checkpoint else 0
+        writer = RowWriter(file, data_format, FIELDS[name], header=not done)
+        progress = Progress(self.stderr, done)
+        rows = export_rows(name, last_id, options['chunk_size'])
+        for chunk in chunks(rows, options['chunk_size']):
+            for values in chunk:
+                writer.write(values)
+            done += len(chunk)
+            if checkpoint is not None:
+                file.flush()
+                checkpoint.save(
+                    done, last_id=chunk[-1][0], offset=file.tell()
+                )
+            progress.add(len(chunk))
+        progress.report()
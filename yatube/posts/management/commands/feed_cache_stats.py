@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from posts.cache import feed_cache_stats, reset_feed_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает счётчики кэша страниц ленты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Обнулить счётчики.'
+        )
+
+    def handle(self, *args, **options):
+        stats = feed_cache_stats()
+        requests = sum(stats.values()) - stats['early']
+        for stat, value in stats.items():
+            self.stdout.write(f'{stat:<6}{value}')
+        if requests:
+            served = stats['hit'] + stats['stale']
+            self.stdout.write(f'доля из кэша: {served / requests:.1%}')
+        if options['reset']:
+            reset_feed_cache_stats()
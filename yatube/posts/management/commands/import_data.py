@@ -0,0 +1,75 @@
+import contextlib
+import sys
+from itertools import islice
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from posts import follow_graph, timeline
+from posts.cache import bump_feed_version
+from posts.transfer import (FORMATS, MODELS, Checkpoint, Progress,
+                            guess_format, import_rows, read_rows,
+                            reset_sequences)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает группы, посты, комментарии или подписки из NDJSON '
+        'или CSV пачками через bulk_create (порядок: group, post, '
+        'comment, follow). Пользователи, на которых ссылаются строки, '
+        'должны уже быть в БД. После загрузки пересчитываются счётчики, '
+        'ленты подписок и поисковый индекс.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument('input', help='Файл или «-» для stdin.')
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='По умолчанию по расширению файла (.csv или NDJSON).'
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help='Файл контрольной точки.')
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help='Не пересчитывать производные данные (например, если '
+                 'дальше загружаются другие модели).'
+        )
+
+    def handle(self, *args, **options):
+        name = options['model']
+        path = options['input']
+        data_format = options['format'] or guess_format(path)
+        checkpoint = Checkpoint(
+            options['checkpoint'], f'import:{name}:{path}'
+        )
+        progress = Progress(self.stdout, checkpoint.rows)
+
+        def on_chunk(count):
+            checkpoint.save(checkpoint.rows + count)
+            progress.add(count)
+
+        if path == '-':
+            file = contextlib.nullcontext(sys.stdin)
+        else:
+            file = open(path, encoding='utf-8', newline='')
+        with file as file:
+            rows = islice(read_rows(file, data_format), checkpoint.rows, None)
+            import_rows(name, rows, options['chunk_size'], on_chunk)
+        progress.report()
+        reset_sequences(name)
+        if not options['skip_derived']:
+            self.update_derived(name)
+        checkpoint.clear()
+
+    def update_derived(self, name):
+        if name in ('post', 'follow'):
+            with transaction.atomic():
+                timeline.rebuild()
+        if name == 'follow':
+            follow_graph.forget_all()
+        if name != 'group':
+            call_command('recount_stats', stdout=self.stdout)
+        if name in ('post', 'comment'):
+            call_command('rebuild_search_index', stdout=self.stdout)
+        bump_feed_version()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from posts.images import process_upload
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт варианты и миниатюры изображений постов, у которых '
+        'их ещё нет (например, загруженных до появления вариантов).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Обработать заново все изображения.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('image', 'image_variants')
+        names = {
+            post.image.name for post in posts.iterator()
+            if options['all'] or not post.variants
+        }
+        failed = 0
+        for name in sorted(names):
+            try:
+                process_upload(name)
+            except OSError as error:
+                failed += 1
+                self.stderr.write(f'{name}: {error}')
+        self.stdout.write(
+            f'Обработано изображений: {len(names) - failed}, '
+            f'с ошибками: {failed}'
+        )
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from posts.cache import bump_feed_version
+from posts.stats import recount_author_stats, recount_comments
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики постов, подписчиков, подписок '
+        'и комментариев и исправляет расхождения.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            authors = recount_author_stats()
+            posts = recount_comments()
+        if authors or posts:
+            bump_feed_version()
+        self.stdout.write(
+            f'Исправлено авторов: {authors}, постов: {posts} '
+            f'за {time.monotonic() - started:.1f} с'
+        )
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-17 04:16
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    AuthorStats = apps.get_model('posts', 'AuthorStats')
+    db_alias = schema_editor.connection.alias
+    duplicates = Follow.objects.using(db_alias).values('user', 'author').annotate(
+        total=Count('pk'), first=Min('pk')
+    ).filter(total__gt=1)
+    for row in duplicates:
+        Follow.objects.using(db_alias).filter(
+            user=row['user'], author=row['author']
+        ).exclude(pk=row['first']).delete()
+        extra = row['total'] - 1
+        AuthorStats.objects.using(db_alias).filter(user_id=row['author']).update(
+            followers_count=F('followers_count') - extra
+        )
+        AuthorStats.objects.using(db_alias).filter(user_id=row['user']).update(
+            following_count=F('following_count') - extra
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date', '-id'], name='post_author_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', '-pub_date', '-id'], name='post_group_feed_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_follows, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('user', 'author'), name='unique_follow'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def fill_pub_dates(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    TimelineEntry = apps.get_model('posts', 'TimelineEntry')
+    db_alias = schema_editor.connection.alias
+    TimelineEntry.objects.using(db_alias).update(pub_date=Subquery(
+        Post.objects.using(db_alias).filter(
+            pk=OuterRef('post_id')
+        ).values('pub_date')[:1]
+    ))
+
+
+def fill_backfilled_to(apps, schema_editor):
+    # Прежняя раскладка тоже брала только последние посты автора:
+    # более старые теперь читаются напрямую.
+    Follow = apps.get_model('posts', 'Follow')
+    Post = apps.get_model('posts', 'Post')
+    TimelineEntry = apps.get_model('posts', 'TimelineEntry')
+    db_alias = schema_editor.connection.alias
+    for follow in Follow.objects.using(db_alias).iterator():
+        oldest = TimelineEntry.objects.using(db_alias).filter(
+            user_id=follow.user_id, post__author_id=follow.author_id
+        ).aggregate(oldest=Min('pub_date'))['oldest']
+        if oldest is None:
+            continue
+        if Post.objects.using(db_alias).filter(
+            author_id=follow.author_id, pub_date__lt=oldest
+        ).exists():
+            Follow.objects.using(db_alias).filter(pk=follow.pk).update(
+                backfilled_to=oldest
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='follow',
+            name='backfilled_to',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Лента заполнена до'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='pub_date',
+            field=models.DateTimeField(null=True, verbose_name='Дата публикации'),
+        ),
+        migrations.RunPython(fill_pub_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='timelineentry',
+            name='pub_date',
+            field=models.DateTimeField(verbose_name='Дата публикации'),
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', '-pub_date', '-post'], name='timeline_user_feed_idx'),
+        ),
+        migrations.RunPython(fill_backfilled_to, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,5 @@
+import json
+
 from core.models import CreatedModel
 from django.contrib.auth import get_user_model
 from django.db import models
@@ -14,6 +16,23 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    FEED_FIELDS = (
+        'id', 'text', 'pub_date', 'updated', 'image', 'image_variants',
+        'author_id', 'group_id', 'comments_count',
+        'author__username', 'author__first_name', 'author__last_name',
+        'group__title', 'group__slug',
+    )
+
+    def for_feed(self):
+        """Выборка для лент: автор и группа подтягиваются тем же
+        запросом, загружаются только поля, которые выводят карточки.
+        """
+        return self.select_related('author', 'group').only(
+            *self.FEED_FIELDS
+        )
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
@@ -23,6 +42,10 @@ class Post(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -44,15 +67,56 @@ class Post(models.Model):
         verbose_name='Картинка',
         help_text='Вы можете загружить картинку к посту'
     )
+    # Список вариантов изображения разных ширин и форматов в JSON,
+    # см. posts.variants.
+    image_variants = models.TextField(
+        verbose_name='Варианты картинки',
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Комментариев',
+        default=0,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        # Ленты сортируются по ключу (pub_date, id), см. CursorPaginator,
+        # поэтому id входит во все индексы лент.
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'), name='post_feed_idx'),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_feed_idx'
+            ),
+        )
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:15]
 
+    @property
+    def variants(self):
+        """Варианты текущего изображения; варианты заменённого
+        изображения не возвращаются.
+        """
+        if not self.image_variants:
+            return []
+        data = json.loads(self.image_variants)
+        if data['source'] != self.image.name:
+            return []
+        return data['items']
+
 
 class Comment(CreatedModel):
     post = models.ForeignKey(
@@ -72,6 +136,15 @@ class Comment(CreatedModel):
         help_text='Введите текст комментария'
     )
 
+    class Meta:
+        # Комментарии поста выводятся по ключу (created, id),
+        # см. posts.views.comments_page.
+        indexes = (
+            models.Index(
+                fields=('post', 'created', 'id'), name='comment_post_idx'
+            ),
+        )
+
     def __str__(self):
         return self.text[:15]
 
@@ -87,3 +160,114 @@ class Follow(models.Model):
         related_name='following',
         on_delete=models.CASCADE
     )
+    # При подписке в ленту раскладываются только последние посты
+    # автора (TIMELINE_BACKFILL); посты не позже этой даты читаются
+    # из постов автора напрямую, см. posts.timeline.
+    backfilled_to = models.DateTimeField(
+        verbose_name='Лента заполнена до', null=True, blank=True,
+        editable=False,
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_follow'
+            ),
+        )
+
+
+class TimelineEntry(models.Model):
+    """Пост в материализованной ленте подписок пользователя."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Читатель',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Пост',
+    )
+    # Копия даты поста: страница ленты читается по индексу записей
+    # без сортировки всей ленты.
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_timeline_entry'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_feed_idx',
+            ),
+        )
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+
+
+class AuthorStats(models.Model):
+    """Счётчики автора, поддерживаемые сигналами."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь',
+    )
+    posts_count = models.PositiveIntegerField(
+        verbose_name='Постов', default=0
+    )
+    followers_count = models.PositiveIntegerField(
+        verbose_name='Подписчиков', default=0
+    )
+    following_count = models.PositiveIntegerField(
+        verbose_name='Подписок', default=0
+    )
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'{self.user}: {self.posts_count}'
+
+
+class Recommendation(models.Model):
+    """Автор, на которого стоит подписаться: на него подписаны
+    авторы из подписок пользователя. Считается командой
+    ``compute_recommendations``.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='Читатель',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommended_to',
+        verbose_name='Автор',
+    )
+    score = models.PositiveIntegerField(
+        verbose_name='Подписок, подписанных на автора'
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_recommendation'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-score'), name='recommendation_user_idx'
+            ),
+        )
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
@@ -0,0 +1,164 @@
+import base64
+import binascii
+import json
+import math
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+
+FORWARD = 'n'
+BACKWARD = 'p'
+# Типы значений ключа в курсоре.
+SCALARS = (str, int, float)
+# Диапазон целых, которые принимает БД.
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def valid_key_value(value):
+    """Значение ключа, по которому можно искать в БД: не None, без
+    бесконечностей и NaN, целые — в пределах 64 бит.
+    """
+    if value is None:
+        return False
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, int):
+        return INT_MIN <= value <= INT_MAX
+    return True
+
+
+class CursorPaginator(Paginator):
+    """Пажинатор по ключу (keyset) вместо LIMIT/OFFSET.
+
+    Страница выбирается непрозрачным курсором — закодированным ключом
+    крайней записи соседней страницы, поэтому запрос к любой по глубине
+    странице стоит одинаково и не требует COUNT(*). Номерные страницы
+    (``get_page``) по-прежнему работают для старых ссылок ``?page=N``.
+    """
+
+    def __init__(self, object_list, per_page, keys=('pub_date', 'id'),
+                 descending=True, **kwargs):
+        self.keys = keys
+        self.descending = descending
+        ordering = [f'-{key}' if descending else key for key in keys]
+        super().__init__(object_list.order_by(*ordering), per_page, **kwargs)
+
+    @property
+    def last_cursor(self):
+        """Курсор последней страницы: ключ не нужен, читаем с конца."""
+        return self._encode(BACKWARD, None)
+
+    def get_cursor_page(self, cursor=None):
+        """Возвращает страницу по курсору.
+
+        Некорректный курсор, как и некорректный номер в ``get_page``,
+        приводит к первой странице.
+        """
+        direction, values = self._decode(cursor)
+        per_page = self.per_page
+        rows = self._rows(direction, values, per_page + 1)
+        if direction == BACKWARD:
+            has_previous = len(rows) > per_page
+            rows = rows[:per_page][::-1]
+            has_next = values is not None
+        else:
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            has_previous = values is not None
+        number = 2 if has_previous else 1
+        # Размер выборки подбирается так, чтобы has_next/has_previous
+        # стандартной Page совпали с тем, что известно по курсору.
+        self.count = (number - 1) * per_page + (
+            per_page + 1 if has_next else len(rows)
+        )
+        page = Page(rows, number, self)
+        self._set_cursors(page, has_previous, has_next)
+        return page
+
+    def _rows(self, direction, values, limit):
+        """До ``limit`` строк после ключа ``values`` в порядке обхода:
+        вперёд — в порядке страницы, назад — в обратном.
+        """
+        queryset = self.object_list
+        if direction == BACKWARD:
+            queryset = queryset.reverse()
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, direction))
+        return list(queryset[:limit])
+
+    def _get_page(self, *args, **kwargs):
+        page = super()._get_page(*args, **kwargs)
+        page.object_list = list(page.object_list)
+        self._set_cursors(page, page.has_previous(), page.has_next())
+        return page
+
+    def _set_cursors(self, page, has_previous, has_next):
+        rows = page.object_list
+        page.previous_cursor = None
+        page.next_cursor = None
+        if rows and has_previous:
+            page.previous_cursor = self._encode(BACKWARD, rows[0])
+        if rows and has_next:
+            page.next_cursor = self._encode(FORWARD, rows[-1])
+
+    def _seek(self, values, direction, keys=None):
+        """Условие «строго после ключа» для сравнения кортежей.
+        ``keys`` — имена тех же ключей в другой модели.
+        """
+        keys = keys or self.keys
+        after = (direction == FORWARD) == self.descending
+        lookup = 'lt' if after else 'gt'
+        conditions = []
+        for i, key in enumerate(keys):
+            condition = dict(zip(keys[:i], values[:i]))
+            condition[f'{key}__{lookup}'] = values[i]
+            conditions.append(Q(**condition))
+        # Избыточная граница по первому ключу позволяет СУБД начать
+        # с поиска по индексу, а не сканировать его с начала.
+        bound = Q(**{f'{keys[0]}__{lookup}e': values[0]})
+        return bound & reduce(or_, conditions)
+
+    def _encode(self, direction, obj):
+        values = None
+        if obj is not None:
+            values = []
+            for key in self.keys:
+                value = getattr(obj, key)
+                values.append(
+                    value.isoformat() if hasattr(value, 'isoformat')
+                    else value
+                )
+        raw = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor):
+        if not cursor:
+            return FORWARD, None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, values = json.loads(raw.decode())
+            if direction not in (FORWARD, BACKWARD):
+                raise ValueError
+            if values is None:
+                return direction, None
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError
+            opts = self.object_list.model._meta
+            values = [
+                opts.get_field(key).to_python(value)
+                for key, value in zip(self.keys, values)
+                if isinstance(value, SCALARS) and not isinstance(value, bool)
+            ]
+            # Пропущенные значения (null, списки, словари) делают ключ
+            # короче.
+            if len(values) != len(self.keys) or not all(
+                map(valid_key_value, values)
+            ):
+                raise ValueError
+            return direction, values
+        except (binascii.Error, ValueError, TypeError, OverflowError,
+                ValidationError):
+            return FORWARD, None
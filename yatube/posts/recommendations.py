@@ -0,0 +1,103 @@
+"""Рекомендации «на кого подписаться» по графу подписок.
+
+Считаются офлайн командой ``compute_recommendations``. Подписки
+загружаются в разреженную матрицу смежности ``A`` (строка — читатель,
+столбец — автор). В произведении ``A·A`` на пересечении читателя
+и автора стоит число авторов из подписок читателя, подписанных на этого
+автора («друзья друзей»). Из кандидатов убираются сам читатель и уже
+известные ему авторы, при равенстве выше стоит автор с большим числом
+подписчиков, для каждого читателя сохраняются лучшие ``top_n``.
+
+Матрица умножается блоками строк, чтобы память не зависела от числа
+пользователей. Нужны пакеты numpy и scipy; страницы сайта читают
+готовые ``Recommendation`` и без них.
+"""
+from itertools import chain
+
+import numpy as np
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from scipy import sparse
+
+from .models import Follow, Recommendation
+
+TOP_N = 20
+ROWS_PER_BLOCK = 1000
+BATCH_SIZE = 5000
+
+
+def follow_matrix(using=DEFAULT_DB_ALIAS):
+    """Разреженная матрица подписок (CSR) размером max(id) + 1."""
+    rows = Follow.objects.using(using).values_list(
+        'user_id', 'author_id'
+    ).iterator(chunk_size=BATCH_SIZE)
+    edges = np.fromiter(
+        chain.from_iterable(rows), dtype=np.int64
+    ).reshape(-1, 2)
+    size = int(edges.max()) + 1 if len(edges) else 0
+    return sparse.csr_matrix(
+        (np.ones(len(edges), dtype=np.int32), (edges[:, 0], edges[:, 1])),
+        shape=(size, size),
+    )
+
+
+def top_candidates(matrix, popularity, start, stop, top_n):
+    """Массивы (читатель, автор, вес) лучших кандидатов для строк
+    ``start:stop``.
+    """
+    block = matrix[start:stop]
+    rows = block.shape[0]
+    # Сам читатель и его подписки — не кандидаты.
+    known = block + sparse.csr_matrix(
+        (np.ones(rows, dtype=np.int32),
+         (np.arange(rows), np.arange(start, start + rows))),
+        shape=block.shape,
+    )
+    paths = block @ matrix
+    paths = paths - paths.multiply(known > 0)
+    paths.eliminate_zeros()
+    paths.sort_indices()
+    paths = paths.tocoo()
+    if not paths.nnz:
+        return paths.row, paths.col, paths.data
+    users, authors = paths.row.astype(np.int64), paths.col
+    # Вес — число путей, при равенстве — популярность автора. Один
+    # ключ «читатель, вес по убыванию» сортируется быстрее lexsort;
+    # устойчивая сортировка сохраняет порядок авторов по id.
+    weight = paths.data.astype(np.int64) * (int(popularity.max()) + 1)
+    weight += popularity[authors]
+    order = np.argsort(
+        users * (int(weight.max()) + 1) - weight, kind='stable'
+    )
+    users, authors, scores = users[order], authors[order], paths.data[order]
+    # Место кандидата среди кандидатов того же читателя.
+    rank = np.arange(len(users)) - np.searchsorted(users, users)
+    keep = rank < top_n
+    return users[keep] + start, authors[keep], scores[keep]
+
+
+def compute_recommendations(top_n=TOP_N, rows_per_block=ROWS_PER_BLOCK,
+                            using=DEFAULT_DB_ALIAS):
+    """Пересчитывает рекомендации всех пользователей одной транзакцией,
+    возвращает их число.
+    """
+    matrix = follow_matrix(using)
+    popularity = np.asarray(matrix.sum(axis=0)).ravel()
+    # Строки вставляются напрямую: bulk_create на SQLite делит их
+    # на запросы по нескольку сотен строк.
+    sql = (
+        f'INSERT INTO {Recommendation._meta.db_table} '
+        '(user_id, author_id, score) VALUES (%s, %s, %s)'
+    )
+    created = 0
+    with transaction.atomic(using=using):
+        Recommendation.objects.using(using).all().delete()
+        with connections[using].cursor() as cursor:
+            for start in range(0, matrix.shape[0], rows_per_block):
+                users, authors, scores = top_candidates(
+                    matrix, popularity, start, start + rows_per_block, top_n
+                )
+                cursor.executemany(sql, list(zip(
+                    users.tolist(), authors.tolist(), scores.tolist()
+                )))
+                created += len(users)
+    return created
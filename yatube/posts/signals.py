@@ -0,0 +1,93 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import follow_graph, stats, timeline
+from .cache import invalidate_feeds
+from .models import (AuthorStats, Comment, Follow, Group, Post,
+                     Recommendation, User)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created:
+        timeline.fan_out_post(instance)
+
+
+# Счётчики подписок подключены раньше лент: лента решает, раскладывать
+# ли посты автора, по его числу подписчиков из счётчика.
+@receiver(post_save, sender=Follow)
+def count_new_follow(sender, instance, created, **kwargs):
+    if created:
+        stats.change_author_stats(instance.author_id, followers_count=1)
+        stats.change_author_stats(instance.user_id, following_count=1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(sender, instance, **kwargs):
+    stats.change_author_stats(instance.author_id, followers_count=-1)
+    stats.change_author_stats(instance.user_id, following_count=-1)
+
+
+@receiver(post_save, sender=Follow)
+def fill_timeline_on_follow(sender, instance, created, **kwargs):
+    if created:
+        timeline.on_follow(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def clean_timeline_on_unfollow(sender, instance, **kwargs):
+    timeline.on_unfollow(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_feed_cache(sender, using, **kwargs):
+    invalidate_feeds(using)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Post)
+def count_new_post(sender, instance, created, **kwargs):
+    if created:
+        stats.change_author_stats(instance.author_id, posts_count=1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    stats.change_author_stats(instance.author_id, posts_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        stats.change_comments_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    stats.change_comments_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def forget_followees(sender, instance, **kwargs):
+    follow_graph.forget([instance.user_id])
+
+
+@receiver(post_save, sender=Follow)
+def drop_recommendation(sender, instance, created, **kwargs):
+    if created:
+        Recommendation.objects.filter(
+            user_id=instance.user_id, author_id=instance.author_id
+        ).delete()
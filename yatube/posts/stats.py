@@ -0,0 +1,102 @@
+"""Денормализованные счётчики постов, комментариев и подписок.
+
+Счётчики меняются атомарно выражениями ``F()`` из сигналов, а функции
+``recount_*`` пересчитывают их по данным и исправляют расхождения.
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import AuthorStats, Comment, Follow, Post, User
+
+STATS_FIELDS = {
+    'posts_count': (Post, 'author'),
+    'followers_count': (Follow, 'author'),
+    'following_count': (Follow, 'user'),
+}
+BATCH_SIZE = 1000
+
+
+def change_author_stats(user_id, **deltas):
+    """Меняет счётчики автора на заданные величины."""
+    updated = AuthorStats.objects.filter(user_id=user_id).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+    if not updated and all(delta > 0 for delta in deltas.values()):
+        # Строки нет (например, данные загружены в обход сигналов):
+        # создаём её с точными значениями. При уменьшении не создаём —
+        # это может быть каскадное удаление самого пользователя.
+        recount_author_stats(User.objects.filter(pk=user_id))
+
+
+def followers_count(author_id, using=DEFAULT_DB_ALIAS):
+    """Число подписчиков из денормализованного счётчика автора."""
+    count = AuthorStats.objects.using(using).filter(
+        user_id=author_id
+    ).values_list('followers_count', flat=True).first()
+    return count or 0
+
+
+def change_comments_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def count_subquery(model, field):
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by(
+    ).values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+def recount_author_stats(users=None):
+    """Пересчитывает счётчики авторов, возвращает число исправленных."""
+    if users is None:
+        users = User.objects.all()
+    users = users.annotate(**{
+        f'actual_{field}': count_subquery(model, lookup)
+        for field, (model, lookup) in STATS_FIELDS.items()
+    }).values('pk', *(f'actual_{field}' for field in STATS_FIELDS))
+    fixed = 0
+    batch = []
+    for row in users.iterator():
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            fixed += save_author_stats(batch)
+            batch = []
+    return fixed + save_author_stats(batch)
+
+
+def save_author_stats(rows):
+    existing = AuthorStats.objects.in_bulk([row['pk'] for row in rows])
+    to_create, to_update = [], []
+    for row in rows:
+        actual = {field: row[f'actual_{field}'] for field in STATS_FIELDS}
+        stats = existing.get(row['pk'])
+        if stats is None:
+            to_create.append(AuthorStats(user_id=row['pk'], **actual))
+        elif any(getattr(stats, f) != v for f, v in actual.items()):
+            for field, value in actual.items():
+                setattr(stats, field, value)
+            to_update.append(stats)
+    AuthorStats.objects.bulk_create(to_create, ignore_conflicts=True)
+    AuthorStats.objects.bulk_update(to_update, list(STATS_FIELDS))
+    return len(to_create) + len(to_update)
+
+
+def recount_comments(posts=None):
+    """Пересчитывает число комментариев, возвращает число исправленных."""
+    if posts is None:
+        posts = Post.objects.all()
+    # Расхождений обычно немного, а читать таблицу, одновременно
+    # обновляя её, SQLite не любит — поэтому сначала выбираем их все.
+    drifted = [
+        Post(pk=pk, comments_count=actual)
+        for pk, actual in posts.order_by().annotate(
+            actual=count_subquery(Comment, 'post')
+        ).exclude(comments_count=F('actual')).values_list('pk', 'actual')
+    ]
+    Post.objects.bulk_update(
+        drifted, ['comments_count'], batch_size=BATCH_SIZE
+    )
+    return len(drifted)
@@ -0,0 +1,51 @@
+from django import template
+from django.core.files.storage import default_storage
+from posts import thumbnails
+
+register = template.Library()
+
+# Ширина карточки поста на странице.
+SIZES = '(min-width: 992px) 960px, 100vw'
+
+
+@register.simple_tag
+def thumbnail_url(post, size):
+    """Адрес миниатюры поста, а пока её нет — исходного изображения."""
+    if not post.image:
+        return ''
+    if not hasattr(post, 'thumbnail_urls'):
+        thumbnails.resolve_thumbnails([post])
+    return post.thumbnail_urls[size]
+
+
+@register.inclusion_tag('posts/includes/picture.html')
+def post_picture(post):
+    """``<picture>`` с вариантами изображения поста, а пока их нет —
+    миниатюра.
+    """
+    srcsets = {}
+    for variant in post.variants:
+        srcsets.setdefault(variant['type'], []).append(variant)
+    # Варианты идут по возрастанию ширины, JPEG — запасной формат.
+    fallback = srcsets.pop('image/jpeg', None)
+    if not fallback:
+        return {'src': thumbnail_url(post, 'card')}
+    largest = fallback[-1]
+    return {
+        'src': default_storage.url(largest['name']),
+        'width': largest['width'],
+        'height': largest['height'],
+        'srcset': srcset(fallback),
+        'sources': [
+            (mime_type, srcset(variants))
+            for mime_type, variants in srcsets.items()
+        ],
+        'sizes': SIZES,
+    }
+
+
+def srcset(variants):
+    return ', '.join(
+        f'{default_storage.url(variant["name"])} {variant["width"]}w'
+        for variant in variants
+    )
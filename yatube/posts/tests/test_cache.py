@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from posts.cache import (bump_feed_version, expires_early, feed_cache_key,
+                         feed_cache_stats, feed_version)
+from posts.models import Post, User
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cache_reader')
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse('posts:index')
+
+    def lock_key(self):
+        response = self.guest_client.get(self.url)
+        return feed_cache_key(response.wsgi_request) + ':lock'
+
+    def test_stats_count_hits_and_misses(self):
+        """Счётчики отражают промахи и попадания."""
+        self.guest_client.get(self.url)
+        self.guest_client.get(self.url)
+        self.guest_client.get(self.url)
+        stats = feed_cache_stats()
+        self.assertEqual(stats['miss'], 1)
+        self.assertEqual(stats['hit'], 2)
+
+    def test_stale_page_served_while_another_request_rebuilds(self):
+        """Пока страницу перестраивает другой запрос, отдаётся старая."""
+        lock_key = self.lock_key()
+        bump_feed_version()
+        cache.add(lock_key, 1)
+        response = self.guest_client.get(self.url)
+        self.assertIsNone(response.context)
+        self.assertEqual(feed_cache_stats()['stale'], 1)
+        cache.delete(lock_key)
+        response = self.guest_client.get(self.url)
+        self.assertIsNotNone(response.context)
+
+    def test_only_lock_holder_rebuilds(self):
+        """Запрос без блокировки не перестраивает устаревшую страницу."""
+        lock_key = self.lock_key()
+        Post.objects.create(author=self.user, text='Новый пост')
+        cache.add(lock_key, 1)
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.url)
+
+    def test_expires_early(self):
+        """Раннее обновление зависит от времени перестройки."""
+        expires = 100.0
+        self.assertFalse(expires_early(expires, 0.1, 90.0, 0.5))
+        self.assertTrue(expires_early(expires, 10.0, 90.0, 0.1))
+        self.assertTrue(expires_early(expires, 0.0, 100.0, 0.5))
+
+
+class FeedCacheCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='commit_author')
+        self.guest_client = Client()
+        self.url = reverse('posts:index')
+
+    def test_page_cached_before_commit_is_rebuilt(self):
+        """Страница, закэшированная параллельным запросом до фиксации
+        записи, перестраивается после фиксации.
+        """
+        response = self.guest_client.get(self.url)
+        key = feed_cache_key(response.wsgi_request)
+        with transaction.atomic():
+            Post.objects.create(author=self.user, text='Новый пост')
+            # Параллельный запрос ещё не видит пост и кэширует страницу
+            # без него под уже новой версией.
+            entry = cache.get(key)
+            entry['version'] = feed_version()
+            cache.set(key, entry)
+        self.assertContains(self.guest_client.get(self.url), 'Новый пост')
@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.cache import bump_feed_version
+from posts.cards import card_key
+from posts.models import Post, User
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='card_author')
+        cls.post = Post.objects.create(author=cls.user, text='Старый текст')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_card_served_from_cache(self):
+        """Пока пост не изменён, карточка берётся из кэша."""
+        self.guest_client.get(reverse('posts:index'))
+        self.assertIn('Старый текст', cache.get(card_key(self.post)))
+        # Без сохранения модели Post.updated не меняется.
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        bump_feed_version()
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertTemplateNotUsed(response, 'posts/includes/post.html')
+        self.assertContains(response, 'Старый текст')
+
+    def test_cards_shared_between_feeds(self):
+        """Карточка, отрисованная для одной ленты, подходит и другим."""
+        self.guest_client.get(reverse('posts:index'))
+        response = self.guest_client.get(
+            reverse('posts:profile', kwargs={'username': self.user})
+        )
+        self.assertTemplateNotUsed(response, 'posts/includes/post.html')
+        self.assertContains(response, 'Старый текст')
+
+    def test_edit_invalidates_card(self):
+        """Правка поста заменяет его карточку."""
+        self.guest_client.get(reverse('posts:index'))
+        old_key = card_key(self.post)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст'},
+        )
+        self.assertIsNone(cache.get(old_key))
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Новый текст')
+        self.assertNotContains(response, 'Старый текст')
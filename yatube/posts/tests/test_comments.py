@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Comment, Post, User
+from posts.views import COMMENTS_PER_PAGE
+
+
+class CommentPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='comment_author')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+        cls.comments = [
+            Comment.objects.create(
+                post=cls.post, author=cls.author, text=f'Комментарий {i}'
+            )
+            for i in range(COMMENTS_PER_PAGE + 5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.detail_url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.pk}
+        )
+        self.comments_url = reverse(
+            'posts:post_comments', kwargs={'post_id': self.post.pk}
+        )
+
+    def test_post_detail_shows_first_page(self):
+        """На странице поста первая страница комментариев по порядку."""
+        response = self.guest_client.get(self.detail_url)
+        comments = response.context['comments']
+        self.assertEqual(
+            list(comments), self.comments[:COMMENTS_PER_PAGE]
+        )
+        self.assertContains(response, comments.next_cursor)
+
+    def test_post_detail_num_queries(self):
+        """Число запросов не зависит от числа комментариев."""
+        # Пост с автором и группой и страница комментариев с авторами.
+        with self.assertNumQueries(2):
+            self.guest_client.get(self.detail_url)
+
+    def test_fragment_loads_next_page(self):
+        """Фрагмент по курсору отдаёт оставшиеся комментарии."""
+        cursor = self.guest_client.get(
+            self.detail_url
+        ).context['comments'].next_cursor
+        response = self.guest_client.get(
+            self.comments_url, {'cursor': cursor}
+        )
+        self.assertTemplateUsed(response, 'posts/includes/comment_list.html')
+        self.assertEqual(
+            list(response.context['comments']),
+            self.comments[COMMENTS_PER_PAGE:]
+        )
+        self.assertIsNone(response.context['comments'].next_cursor)
+        self.assertNotContains(response, '<html')
+
+    def test_json_comments(self):
+        """В формате JSON — комментарии и курсор следующей страницы."""
+        response = self.guest_client.get(
+            self.comments_url, {'format': 'json'}
+        )
+        data = response.json()
+        self.assertEqual(len(data['comments']), COMMENTS_PER_PAGE)
+        self.assertEqual(data['comments'][0], {
+            'id': self.comments[0].pk,
+            'author': self.author.username,
+            'text': self.comments[0].text,
+            'created': self.comments[0].created.isoformat(),
+        })
+        response = self.guest_client.get(
+            self.comments_url,
+            {'format': 'json', 'cursor': data['next_cursor']}
+        )
+        self.assertEqual(len(response.json()['comments']), 5)
+        self.assertIsNone(response.json()['next_cursor'])
+
+    def test_unknown_post_comments(self):
+        """Комментарии несуществующего поста — 404."""
+        response = self.guest_client.get(
+            reverse('posts:post_comments', kwargs={'post_id': 0})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,87 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+from core.routers import PRIMARY_COOKIE
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Comment, Group, Post, User
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='conditional')
+        cls.group = Group.objects.create(
+            title='Группа', slug='conditional', description=''
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Пост'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.user.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+
+    def test_not_modified_without_rendering(self):
+        """Повторный запрос неизменившейся страницы получает 304
+        без запросов к БД и отрисовки шаблона.
+        """
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response['ETag']
+                last_modified = response['Last-Modified']
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+                self.assertEqual(response.templates, [])
+                response = self.client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_modified_after_comment(self):
+        """После нового комментария страницы отдаются заново."""
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_differs_per_user(self):
+        """Страница авторизованного пользователя имеет свой ETag."""
+        url = reverse('posts:index')
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(DATABASE_REPLICAS=['replica'], REPLICA_LAG=60)
+    def test_no_validators_while_replicas_lag(self):
+        """Сразу после изменения данных, пока реплики могут отставать,
+        ETag и Last-Modified не выдаются.
+        """
+        Post.objects.create(author=self.user, text='Свежий пост')
+        # Сам запрос читает основную БД: реплики в тестах нет.
+        self.client.cookies[PRIMARY_COOKIE] = '1'
+        response = self.client.get(self.urls[-1])
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+        with mock.patch('time.time', return_value=time.time() + 61):
+            response = self.client.get(self.urls[-1])
+        self.assertTrue(response.has_header('ETag'))
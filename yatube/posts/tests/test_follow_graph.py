@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from posts import follow_graph
+from posts.cache import feed_cache_key, feed_version
+from posts.models import AuthorStats, Follow, Post, TimelineEntry, User
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='graph_reader')
+        cls.authors = [
+            User.objects.create_user(username=f'graph_author_{i}')
+            for i in range(3)
+        ]
+        for author in cls.authors:
+            Post.objects.create(author=author, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertStats(self, user, **counts):
+        stats = AuthorStats.objects.get(user=user)
+        for field, value in counts.items():
+            self.assertEqual(getattr(stats, field), value, field)
+
+    def test_followees_cached_and_invalidated(self):
+        """Подписки читаются из кэша и сбрасываются при записи."""
+        author = self.authors[0]
+        self.assertFalse(follow_graph.is_following(self.reader.pk, author.pk))
+        with self.assertNumQueries(0):
+            self.assertFalse(
+                follow_graph.is_following(self.reader.pk, author.pk)
+            )
+        self.assertTrue(follow_graph.follow(self.reader.pk, author.pk))
+        self.assertFalse(follow_graph.follow(self.reader.pk, author.pk))
+        self.assertTrue(follow_graph.is_following(self.reader.pk, author.pk))
+        self.assertEqual(follow_graph.followers_count(author.pk), 1)
+        self.assertTrue(follow_graph.unfollow(self.reader.pk, author.pk))
+        self.assertFalse(follow_graph.unfollow(self.reader.pk, author.pk))
+        self.assertFalse(follow_graph.is_following(self.reader.pk, author.pk))
+
+    def test_self_follow_ignored(self):
+        """На себя подписаться нельзя."""
+        self.assertFalse(follow_graph.follow(self.reader.pk, self.reader.pk))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_forget_all(self):
+        """После загрузки в обход сигналов кэш сбрасывается целиком."""
+        author = self.authors[0]
+        follow_graph.followee_ids(self.reader.pk)
+        Follow.objects.bulk_create([Follow(user=self.reader, author=author)])
+        self.assertFalse(follow_graph.is_following(self.reader.pk, author.pk))
+        follow_graph.forget_all()
+        self.assertTrue(follow_graph.is_following(self.reader.pk, author.pk))
+
+    def test_follow_many(self):
+        """Массовая подписка обновляет счётчики, ленты и кэш."""
+        follow_graph.follow(self.reader.pk, self.authors[0].pk)
+        follow_graph.followee_ids(self.reader.pk)
+        pairs = [(self.reader.pk, author.pk) for author in self.authors]
+        pairs.append((self.reader.pk, self.reader.pk))
+        self.assertEqual(follow_graph.follow_many(pairs), 2)
+        self.assertEqual(
+            list(follow_graph.followee_ids(self.reader.pk)),
+            sorted(author.pk for author in self.authors),
+        )
+        self.assertStats(self.reader, following_count=3)
+        self.assertStats(self.authors[1], followers_count=1)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.reader).count(), 3
+        )
+
+    def test_unfollow_many(self):
+        """Массовая отписка удаляет подписки и посты из ленты."""
+        pairs = [(self.reader.pk, author.pk) for author in self.authors]
+        follow_graph.follow_many(pairs)
+        self.assertEqual(follow_graph.unfollow_many(pairs[:2]), 2)
+        self.assertEqual(follow_graph.unfollow_many(pairs[:2]), 0)
+        self.assertEqual(
+            list(follow_graph.followee_ids(self.reader.pk)),
+            [self.authors[2].pk],
+        )
+        self.assertStats(self.reader, following_count=1)
+        self.assertStats(self.authors[0], followers_count=0)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.reader).count(), 1
+        )
+
+
+class FollowGraphCommitTests(TransactionTestCase):
+    def test_feed_cached_before_commit_is_rebuilt(self):
+        """Лента, закэшированная до фиксации массовой подписки,
+        перестраивается после фиксации.
+        """
+        cache.clear()
+        reader = User.objects.create_user(username='commit_reader')
+        author = User.objects.create_user(username='commit_author')
+        Post.objects.create(author=author, text='Пост автора')
+        client = Client()
+        client.force_login(reader)
+        url = reverse('posts:follow_index')
+        response = client.get(url)
+        key = feed_cache_key(response.wsgi_request, per_user=True)
+        with transaction.atomic():
+            follow_graph.follow_many([(reader.pk, author.pk)])
+            entry = cache.get(key)
+            entry['version'] = feed_version()
+            cache.set(key, entry)
+        self.assertContains(client.get(url), 'Пост автора')
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.cache import feed_cache_stats
+from posts.models import Follow, Post, User
+
+
+class HolePunchingTests(TestCase):
+    """Скелет страницы общий, личные части дописываются для каждого."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='hole_author')
+        cls.follower = User.objects.create_user(username='hole_follower')
+        cls.reader = User.objects.create_user(username='hole_reader')
+        Follow.objects.create(user=cls.follower, author=cls.author)
+        cls.post = Post.objects.create(
+            author=cls.author, text='<!--hole:user_nav-->'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.clients = {}
+        for user in (self.author, self.follower, self.reader):
+            self.clients[user] = Client()
+            self.clients[user].force_login(user)
+
+    def test_authenticated_users_hit_shared_page(self):
+        """Страница, построенная для гостя, отдаётся и авторизованным."""
+        url = reverse('posts:index')
+        response = self.guest_client.get(url)
+        self.assertContains(response, 'Войти')
+        self.assertNotContains(response, 'Избранные авторы')
+        response = self.clients[self.reader].get(url)
+        self.assertContains(response, 'Пользователь: hole_reader')
+        self.assertContains(response, 'Избранные авторы')
+        self.assertNotContains(response, 'Войти')
+        stats = feed_cache_stats()
+        self.assertEqual(stats['miss'], 1)
+        self.assertEqual(stats['hit'], 1)
+
+    def test_follow_button_per_user(self):
+        """Кнопка подписки зависит от того, кто смотрит профиль."""
+        url = reverse('posts:profile', args=[self.author.username])
+        unfollow = reverse('posts:profile_unfollow', args=['hole_author'])
+        follow = reverse('posts:profile_follow', args=['hole_author'])
+        response = self.clients[self.follower].get(url)
+        self.assertContains(response, unfollow)
+        response = self.clients[self.reader].get(url)
+        self.assertContains(response, follow)
+        self.assertNotContains(response, unfollow)
+        response = self.clients[self.author].get(url)
+        self.assertNotContains(response, follow)
+        self.assertNotContains(response, unfollow)
+        self.assertEqual(feed_cache_stats()['miss'], 1)
+
+    def test_post_detail_holes(self):
+        """Форма комментария с CSRF-токеном и кнопка редактирования
+        дописываются в закэшированную страницу поста.
+        """
+        url = reverse('posts:post_detail', args=[self.post.pk])
+        edit_url = reverse('posts:post_edit', args=[self.post.pk])
+        response = self.guest_client.get(url)
+        self.assertNotContains(response, 'csrfmiddlewaretoken')
+        self.assertNotContains(response, edit_url)
+        response = self.clients[self.reader].get(url)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertNotContains(response, edit_url)
+        response = self.clients[self.author].get(url)
+        self.assertContains(response, edit_url)
+        self.assertEqual(feed_cache_stats()['miss'], 1)
+
+    def test_user_text_is_not_filled(self):
+        """Метка в тексте поста экранирована и не заполняется."""
+        response = self.clients[self.reader].get(reverse('posts:index'))
+        self.assertContains(response, '&lt;!--hole:user_nav--&gt;')
+        self.assertContains(response, 'Пользователь: hole_reader', count=1)
+
+    def test_follow_index_cached_per_user(self):
+        """Лента подписок кэшируется для каждого пользователя."""
+        url = reverse('posts:follow_index')
+        response = self.clients[self.follower].get(url)
+        self.assertContains(response, 'hole_author')
+        response = self.clients[self.reader].get(url)
+        self.assertNotContains(response, reverse(
+            'posts:profile', args=['hole_author']
+        ))
+        self.assertEqual(feed_cache_stats()['miss'], 2)
+
+    def test_etag_differs_per_user(self):
+        """Общий скелет не даёт общего ETag: дырки у всех разные."""
+        url = reverse('posts:index')
+        etags = {
+            self.clients[user].get(url)['ETag']
+            for user in (self.author, self.reader)
+        }
+        self.assertEqual(len(etags), 2)
@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Post, User
+from posts.paginators import CursorPaginator
+
+
+class CursorPaginatorTests(TestCase):
+
+    BATCH_SIZE = 25
+    PER_PAGE = 10
+    # Ключи ["2020-01-01T00:00:00+00:00", Infinity] и [..., 10**30].
+    OVERFLOW_CURSORS = (
+        'WyJuIixbIjIwMjAtMDEtMDFUMDA6MDA6MDArMDA6MDAiLEluZmluaXR5XV0',
+        'WyJuIixbIjIwMjAtMDEtMDFUMDA6MDA6MDArMDA6MDAiLDEwMDAwMDAwMDAwMDAw'
+        'MDAwMDAwMDAwMDAwMDAwMDAwMDBdXQ',
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cursor_user')
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Текст {i}')
+            for i in range(cls.BATCH_SIZE)
+        )
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+
+    def get_paginator(self):
+        return CursorPaginator(Post.objects.all(), self.PER_PAGE)
+
+    def test_forward_walk_returns_every_post_once(self):
+        """Проход вперёд по курсорам выдаёт все посты по порядку."""
+        paginator = self.get_paginator()
+        page = paginator.get_cursor_page()
+        seen = [post.id for post in page]
+        while page.has_next():
+            page = self.get_paginator().get_cursor_page(page.next_cursor)
+            seen.extend(post.id for post in page)
+        self.assertEqual(seen, self.expected)
+        self.assertFalse(page.has_next())
+        self.assertIsNone(page.next_cursor)
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Курсор назад возвращает предыдущую страницу."""
+        first = self.get_paginator().get_cursor_page()
+        second = self.get_paginator().get_cursor_page(first.next_cursor)
+        self.assertTrue(second.has_previous())
+        back = self.get_paginator().get_cursor_page(second.previous_cursor)
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_last_cursor_returns_oldest_posts(self):
+        """Курсор последней страницы возвращает самые старые посты."""
+        paginator = self.get_paginator()
+        page = paginator.get_cursor_page(paginator.last_cursor)
+        self.assertEqual(
+            [post.id for post in page], self.expected[-self.PER_PAGE:]
+        )
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Некорректный курсор приводит к первой странице."""
+        cursors = (
+            '', 'мусор', 'WyJ4IiwxXQ', 'WyJuIixbMV1d',
+            # Ключ из null, списков, словарей, строки и логических.
+            'WyJuIixbbnVsbCxudWxsXV0', 'WyJwIixbbnVsbCwxXV0',
+            'WyJuIixbWzFdLDFdXQ', 'WyJuIixbeyJhIjoxfSwyXV0',
+            'WyJuIiwieHgiXQ', 'WyJuIixbdHJ1ZSwxXV0',
+            *self.OVERFLOW_CURSORS,
+        )
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                page = self.get_paginator().get_cursor_page(cursor)
+                self.assertEqual(
+                    [post.id for post in page],
+                    self.expected[:self.PER_PAGE]
+                )
+
+    def test_overflowing_cursor_in_views(self):
+        """Курсор с бесконечностью или огромным id не ломает ленты."""
+        urls = (reverse('posts:index'), reverse('api:index'))
+        for url in urls:
+            for cursor in self.OVERFLOW_CURSORS:
+                with self.subTest(url=url, cursor=cursor):
+                    cache.clear()
+                    response = Client().get(url, {'cursor': cursor})
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_cursor_page_does_not_count(self):
+        """Страница по курсору — один запрос, без COUNT(*)."""
+        first = self.get_paginator().get_cursor_page()
+        paginator = self.get_paginator()
+        with self.assertNumQueries(1):
+            page = paginator.get_cursor_page(first.next_cursor)
+            page.has_next()
+            page.has_previous()
+
+    def test_views_render_cursor_links(self):
+        """Ссылки пажинатора в шаблоне ведут по курсорам."""
+        cache.clear()
+        response = Client().get(reverse('posts:index'))
+        page = response.context['page_obj']
+        self.assertContains(response, f'?cursor={page.next_cursor}')
+        response = Client().get(
+            reverse('posts:index'), {'cursor': page.next_cursor}
+        )
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            self.expected[self.PER_PAGE:2 * self.PER_PAGE]
+        )
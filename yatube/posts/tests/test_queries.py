@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Follow, Group, Post, User
+from posts.views import NUMBER_OF_POSTS
+
+
+class FeedQueriesTests(TestCase):
+    """Число запросов лент не зависит от числа постов на странице."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        cls.authors = [
+            User.objects.create_user(
+                username=f'author_{i}', first_name='Имя', last_name='Фамилия'
+            )
+            for i in range(NUMBER_OF_POSTS + 2)
+        ]
+        for author in cls.authors:
+            Follow.objects.create(user=cls.reader, author=author)
+            Post.objects.create(
+                author=author, text='Текст поста', group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def test_public_feeds_num_queries(self):
+        """Публичные ленты: фиксированное число запросов."""
+        author = self.authors[0]
+        feeds = {
+            # Страница постов.
+            reverse('posts:index'): 1,
+            # Группа и страница постов.
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}): 2,
+            # Автор со счётчиками и страница постов.
+            reverse('posts:profile', kwargs={'username': author}): 2,
+        }
+        for url, queries in feeds.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+    def test_follow_index_num_queries(self):
+        """Лента подписок: сессия, пользователь, популярные авторы,
+        подписки с прямым чтением, страница постов и рекомендации.
+        """
+        with self.assertNumQueries(6):
+            self.authorized_client.get(reverse('posts:follow_index'))
+
+    def test_feed_renders_author_without_extra_queries(self):
+        """Карточки выводят автора из той же выборки."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Имя Фамилия', count=NUMBER_OF_POSTS)
@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Follow, Recommendation, User
+from posts.recommendations import compute_recommendations
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='rec_reader')
+        names = ('first', 'second', 'popular', 'rare', 'famous')
+        cls.users = {
+            name: User.objects.create_user(username=f'rec_{name}')
+            for name in names
+        }
+        first, second = cls.users['first'], cls.users['second']
+        follows = (
+            (cls.reader, first), (cls.reader, second),
+            (first, second), (first, cls.reader),
+            (first, cls.users['popular']), (second, cls.users['popular']),
+            (first, cls.users['rare']), (second, cls.users['famous']),
+            (cls.users['popular'], cls.users['famous']),
+        )
+        for user, author in follows:
+            Follow.objects.create(user=user, author=author)
+
+    def setUp(self):
+        cache.clear()
+
+    def recommended(self, user):
+        return list(user.recommendations.order_by('-score').values_list(
+            'author__username', 'score'
+        ))
+
+    def test_friends_of_friends(self):
+        """Рекомендуются авторы из подписок подписок, кроме себя
+        и уже известных; при равном весе — более популярный.
+        """
+        compute_recommendations()
+        self.assertEqual(self.recommended(self.reader), [
+            ('rec_popular', 2), ('rec_famous', 1), ('rec_rare', 1),
+        ])
+
+    def test_top_n(self):
+        """Сохраняются только лучшие ``top_n`` на пользователя."""
+        compute_recommendations(top_n=1, rows_per_block=2)
+        self.assertEqual(
+            self.recommended(self.reader), [('rec_popular', 2)]
+        )
+        self.assertEqual(
+            Recommendation.objects.filter(user=self.users['first']).count(),
+            1,
+        )
+
+    def test_recompute_replaces(self):
+        """Повторный расчёт заменяет прежние рекомендации."""
+        compute_recommendations()
+        compute_recommendations()
+        self.assertEqual(len(self.recommended(self.reader)), 3)
+
+    def test_follow_index_shows_recommendations(self):
+        """Лента подписок показывает рекомендации; после подписки
+        автор из них пропадает.
+        """
+        call_command('compute_recommendations', stdout=StringIO())
+        client = Client()
+        client.force_login(self.reader)
+        url = reverse('posts:follow_index')
+        profile = reverse('posts:profile', args=['rec_popular'])
+        response = client.get(url)
+        self.assertContains(response, 'Рекомендуем подписаться')
+        self.assertContains(response, profile)
+        Follow.objects.create(user=self.reader, author=self.users['popular'])
+        self.assertNotContains(client.get(url), profile)
@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from posts.models import AuthorStats, Comment, Follow, Post, User
+
+
+class StatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='stats_author')
+        cls.reader = User.objects.create_user(username='stats_reader')
+
+    def assertStats(self, user, **expected):
+        stats = AuthorStats.objects.get(user=user)
+        for field, value in expected.items():
+            with self.subTest(field=field):
+                self.assertEqual(getattr(stats, field), value)
+
+    def test_stats_created_for_new_user(self):
+        """У нового пользователя есть нулевые счётчики."""
+        self.assertStats(
+            self.author, posts_count=0, followers_count=0, following_count=0
+        )
+
+    def test_post_and_comment_counters(self):
+        """Счётчики постов и комментариев следят за созданием
+        и удалением.
+        """
+        post = Post.objects.create(author=self.author, text='Пост')
+        Post.objects.create(author=self.author, text='Пост 2')
+        self.assertStats(self.author, posts_count=2)
+        comment = Comment.objects.create(
+            post=post, author=self.reader, text='Комментарий'
+        )
+        Comment.objects.create(post=post, author=self.reader, text='Ещё')
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 2)
+        comment.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 1)
+        post.delete()
+        self.assertStats(self.author, posts_count=1)
+
+    def test_follow_counters(self):
+        """Счётчики подписчиков и подписок следят за подписками."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.assertStats(self.author, followers_count=1, following_count=0)
+        self.assertStats(self.reader, followers_count=0, following_count=1)
+        Follow.objects.filter(user=self.reader).delete()
+        self.assertStats(self.author, followers_count=0)
+        self.assertStats(self.reader, following_count=0)
+
+    def test_recount_stats_repairs_drift(self):
+        """Команда recount_stats исправляет расхождения."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        Comment.objects.create(post=post, author=self.reader, text='Текст')
+        Follow.objects.create(user=self.reader, author=self.author)
+        AuthorStats.objects.update(
+            posts_count=10, followers_count=10, following_count=10
+        )
+        AuthorStats.objects.filter(user=self.reader).delete()
+        Post.objects.update(comments_count=5)
+        call_command('recount_stats', stdout=StringIO())
+        self.assertStats(
+            self.author, posts_count=1, followers_count=1, following_count=0
+        )
+        self.assertStats(
+            self.reader, posts_count=0, followers_count=0, following_count=1
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 1)
+
+    def test_user_deletion_does_not_recreate_stats(self):
+        """Удаление автора с постами и подписками проходит без ошибок."""
+        Post.objects.create(author=self.author, text='Пост')
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.author.delete()
+        self.assertFalse(
+            AuthorStats.objects.filter(user_id=self.author.pk).exists()
+        )
+        self.assertStats(self.reader, following_count=0)
@@ -0,0 +1,96 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts import thumbnails
+from posts.cache import bump_feed_version
+from posts.models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, BACKGROUND_TASKS_EAGER=True)
+class ThumbnailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='thumb_author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def create_post(self, name='small.gif'):
+        return Post.objects.create(
+            author=self.user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile(name, SMALL_GIF, 'image/gif'),
+        )
+
+    def test_original_shown_until_thumbnail_ready(self):
+        """Пока миниатюры нет, выводится исходное изображение,
+        а миниатюра создаётся в фоне.
+        """
+        post = self.create_post()
+        url = reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        self.assertContains(self.client.get(url), post.image.url)
+        thumbnail = thumbnails.cached_thumbnail(post.image, 'card')
+        self.assertIsNotNone(thumbnail)
+        self.assertEqual(list(thumbnail.size), [960, 339])
+        response = self.client.get(url)
+        self.assertContains(response, thumbnail.url)
+        self.assertNotContains(response, post.image.url)
+
+    def test_thumbnails_generated_on_edit(self):
+        """Новое изображение получает миниатюры сразу после сохранения."""
+        post = self.create_post()
+        self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={
+                'text': post.text,
+                'image': SimpleUploadedFile(
+                    'edited.gif', SMALL_GIF, 'image/gif'
+                ),
+            },
+        )
+        post.refresh_from_db()
+        self.assertIsNotNone(thumbnails.cached_thumbnail(post.image, 'card'))
+
+    def test_feed_page_reads_thumbnails_at_once(self):
+        """Миниатюры страницы ленты читаются одним обращением к кэшу,
+        а при его промахе — одним запросом к БД.
+        """
+        posts = [self.create_post(f'feed_{i}.gif') for i in range(3)]
+        for post in posts:
+            thumbnails.generate_thumbnails(post.image.name)
+        urls = [
+            thumbnails.cached_thumbnail(post.image, 'card').url
+            for post in posts
+        ]
+        cache.clear()
+        guest_client = Client()
+        # Страница постов и хранилище миниатюр.
+        with self.assertNumQueries(2):
+            response = guest_client.get(reverse('posts:index'))
+        for url in urls:
+            self.assertContains(response, url)
+        bump_feed_version()
+        with self.assertNumQueries(1):
+            guest_client.get(reverse('posts:index'))
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import (Client, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+from django.utils import timezone
+from posts.models import Follow, Post, TimelineEntry, User
+from posts.timeline import (CELEBRITIES_CACHE_KEY, TimelinePaginator,
+                            celebrity_ids, timeline_posts)
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.another_reader = User.objects.create_user(username='reader_2')
+        cls.author = User.objects.create_user(username='writer')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_new_post_is_fanned_out_to_followers(self):
+        """Новый пост попадает в материализованную ленту подписчика."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        post = Post.objects.create(author=self.author, text='Новый пост')
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.another_reader).exists()
+        )
+
+    def test_follow_backfills_and_unfollow_cleans_timeline(self):
+        """Подписка добавляет старые посты автора, отписка убирает их."""
+        post = Post.objects.create(author=self.author, text='Старый пост')
+        self.client.get(reverse(
+            'posts:profile_follow', kwargs={'username': self.author.username}
+        ))
+        self.assertIn(post, timeline_posts(self.reader))
+        self.client.get(reverse(
+            'posts:profile_unfollow',
+            kwargs={'username': self.author.username}
+        ))
+        self.assertNotIn(post, timeline_posts(self.reader))
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_popular_author_is_read_without_fan_out(self):
+        """Посты популярного автора не раскладываются, но видны в ленте."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        Follow.objects.create(user=self.another_reader, author=self.author)
+        post = Post.objects.create(author=self.author, text='Популярный пост')
+        self.assertFalse(TimelineEntry.objects.filter(post=post).exists())
+        for user in (self.reader, self.another_reader):
+            with self.subTest(user=user):
+                self.assertIn(post, timeline_posts(user))
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertIn(post, response.context['page_obj'])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_author_back_under_limit_is_backfilled(self):
+        """Автор, потерявший подписчиков, снова раскладывается по лентам."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        Follow.objects.create(user=self.another_reader, author=self.author)
+        post = Post.objects.create(author=self.author, text='Пост')
+        Follow.objects.filter(user=self.another_reader).delete()
+        self.assertIn(post, timeline_posts(self.reader))
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+
+    @override_settings(TIMELINE_BACKFILL=2)
+    def test_posts_past_backfill_limit_are_read_directly(self):
+        """Посты старше заполненной части ленты не теряются: страницы
+        сливают записи ленты с постами автора в общем порядке.
+        """
+        other_author = User.objects.create_user(username='other_writer')
+        start = timezone.now() - timedelta(days=1)
+        posts = []
+        for i in range(6):
+            post = Post.objects.create(
+                author=(self.author, other_author)[i % 2], text=f'Пост {i}'
+            )
+            post.pub_date = start + timedelta(minutes=i)
+            post.save(update_fields=['pub_date'])
+            posts.append(post)
+        Follow.objects.create(user=self.reader, author=self.author)
+        Follow.objects.create(user=self.reader, author=other_author)
+        self.assertEqual(
+            TimelineEntry.objects.filter(
+                user=self.reader, post__author=self.author
+            ).count(),
+            2,
+        )
+        self.assertEqual(
+            Follow.objects.get(
+                user=self.reader, author=self.author
+            ).backfilled_to,
+            posts[0].pub_date,
+        )
+        newest_first = posts[::-1]
+        self.assertEqual(
+            list(timeline_posts(self.reader).order_by('-pub_date')),
+            newest_first,
+        )
+        paginator = TimelinePaginator(Post.objects.all(), 4, user=self.reader)
+        first_page = paginator.get_cursor_page()
+        self.assertEqual(list(first_page), newest_first[:4])
+        second_page = paginator.get_cursor_page(first_page.next_cursor)
+        self.assertEqual(list(second_page), newest_first[4:])
+        self.assertIsNone(second_page.next_cursor)
+        self.assertEqual(
+            list(paginator.get_cursor_page(second_page.previous_cursor)),
+            newest_first[:4],
+        )
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            list(response.context['page_obj']), newest_first
+        )
+
+
+class CelebritiesCommitTests(TransactionTestCase):
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_celebrities_cached_before_commit_are_forgotten(self):
+        """Список популярных авторов, закэшированный параллельным
+        запросом до фиксации подписки, сбрасывается после фиксации.
+        """
+        cache.clear()
+        author = User.objects.create_user(username='commit_celebrity')
+        readers = [
+            User.objects.create_user(username=f'commit_reader_{i}')
+            for i in range(2)
+        ]
+        Follow.objects.create(user=readers[0], author=author)
+        self.assertEqual(celebrity_ids(), [])
+        with transaction.atomic():
+            Follow.objects.create(user=readers[1], author=author)
+            # Параллельный запрос ещё не видит новую подписку.
+            cache.set(CELEBRITIES_CACHE_KEY, [])
+        self.assertEqual(celebrity_ids(), [author.pk])
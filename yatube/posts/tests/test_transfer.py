@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from posts.models import AuthorStats, Comment, Follow, Group, Post, User
+from posts.transfer import FIELDS, MODELS
+from search.index import SearchResults
+
+ORDER = ('group', 'post', 'comment', 'follow')
+
+
+class TransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.author = User.objects.create_user(username='transfer_author')
+        self.reader = User.objects.create_user(username='transfer_reader')
+        self.group = Group.objects.create(
+            title='Группа', slug='transfer', description='Описание'
+        )
+        self.old_date = timezone.now() - timedelta(days=30)
+        self.post = Post.objects.create(
+            author=self.author, group=self.group, text='Выгружаемый пост'
+        )
+        Post.objects.filter(pk=self.post.pk).update(pub_date=self.old_date)
+        Post.objects.create(author=self.author, text='Пост без группы')
+        Comment.objects.create(
+            post=self.post, author=self.reader,
+            text='Комментарий, с "кавычками"',
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def snapshot(self):
+        return {
+            name: list(
+                MODELS[name].objects.order_by('pk').values_list(*FIELDS[name])
+            )
+            for name in ORDER
+        }
+
+    def run_command(self, *args, **options):
+        call_command(*args, stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_roundtrip(self):
+        """Выгруженные данные загружаются обратно без потерь, а счётчики,
+        ленты и поиск пересчитываются.
+        """
+        expected = self.snapshot()
+        for extension in ('ndjson', 'csv'):
+            with self.subTest(format=extension):
+                for name in ORDER:
+                    self.run_command(
+                        'export_data', name, self.path(f'{name}.{extension}')
+                    )
+                for name in reversed(ORDER):
+                    MODELS[name].objects.all().delete()
+                for name in ORDER:
+                    self.run_command(
+                        'import_data', name,
+                        self.path(f'{name}.{extension}')
+                    )
+                self.assertEqual(self.snapshot(), expected)
+                post = Post.objects.get(pk=self.post.pk)
+                self.assertEqual(post.pub_date, self.old_date)
+                self.assertEqual(post.comments_count, 1)
+                stats = AuthorStats.objects.get(user=self.author)
+                self.assertEqual(
+                    (stats.posts_count, stats.followers_count), (2, 1)
+                )
+                self.assertTrue(
+                    self.reader.timeline.filter(post=self.post).exists()
+                )
+                self.assertEqual(
+                    list(SearchResults('кавычками')[:1]), [post]
+                )
+
+    def test_import_resumes_from_checkpoint(self):
+        """Загрузка продолжается с контрольной точки, а повтор уже
+        загруженных строк их не задваивает.
+        """
+        data = self.path('groups.ndjson')
+        checkpoint = self.path('groups.checkpoint')
+        with open(data, 'w') as file:
+            for i in range(5):
+                file.write(json.dumps({
+                    'id': 100 + i, 'title': f'Группа {i}',
+                    'slug': f'group-{i}', 'description': '',
+                }) + '\n')
+        with open(checkpoint, 'w') as file:
+            # Первые три строки «загружены», третья — до сбоя без
+            # обновления контрольной точки.
+            json.dump({'source': f'import:group:{data}', 'rows': 2}, file)
+        Group.objects.create(
+            id=102, title='Группа 2', slug='group-2', description=''
+        )
+        self.run_command(
+            'import_data', 'group', data, checkpoint=checkpoint,
+            chunk_size=2,
+        )
+        self.assertEqual(
+            list(Group.objects.filter(pk__gte=100).values_list(
+                'pk', flat=True
+            ).order_by('pk')),
+            [102, 103, 104],
+        )
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_export_resumes_from_checkpoint(self):
+        """Выгрузка продолжается после последнего сохранённого id."""
+        data = self.path('posts.csv')
+        checkpoint = self.path('posts.checkpoint')
+        first = Post.objects.order_by('pk').first()
+        with open(data, 'w', newline='') as file:
+            file.write(','.join(FIELDS['post']) + '\r\n')
+            offset = file.tell()
+            file.write('недописанная строка')
+        with open(checkpoint, 'w') as file:
+            json.dump({
+                'source': f'export:post:{data}', 'rows': 1,
+                'last_id': first.pk, 'offset': offset,
+            }, file)
+        self.run_command('export_data', 'post', data, checkpoint=checkpoint)
+        with open(data) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(
+            [line.split(',')[0] for line in lines[1:]],
+            [
+                str(pk) for pk in Post.objects.filter(
+                    pk__gt=first.pk
+                ).order_by('pk').values_list('pk', flat=True)
+            ],
+        )
+        self.assertFalse(os.path.exists(checkpoint))
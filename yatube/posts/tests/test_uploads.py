@@ -0,0 +1,169 @@
+import shutil
+import struct
+import tempfile
+import tracemalloc
+import warnings
+import zlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import (SimpleUploadedFile,
+                                            TemporaryUploadedFile)
+from django.core.files.uploadhandler import load_handler
+from django.http.multipartparser import MultiPartParser
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from posts.forms import PostForm
+from posts.models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+UPLOAD_SIZE = 50 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Память, которую разрешено занять на обработку загрузки.
+MEMORY_LIMIT = 5 * 1024 * 1024
+BOUNDARY = 'BoUnDaRy'
+
+
+def jpeg(width, height):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'white').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def png_header(width, height):
+    """PNG, в заголовке которого заявлен заданный размер."""
+    def chunk(kind, data):
+        crc = struct.pack('>I', zlib.crc32(kind + data))
+        return struct.pack('>I', len(data)) + kind + data + crc
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr)
+        + chunk(b'IDAT', zlib.compress(b'')) + chunk(b'IEND', b'')
+    )
+
+
+def write_padded(file, head, size):
+    """Пишет ``head`` и дополняет файл нулями до ``size`` байт."""
+    file.write(head)
+    left = size - len(head)
+    while left > 0:
+        file.write(b'\0' * min(CHUNK_SIZE, left))
+        left -= CHUNK_SIZE
+    file.seek(0)
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class UploadMemoryTests(TestCase):
+    def test_multipart_upload_spooled_to_disk(self):
+        """Загрузка 50 МБ пишется во временный файл по частям."""
+        with tempfile.TemporaryFile() as body:
+            body.write((
+                f'--{BOUNDARY}\r\n'
+                'Content-Disposition: form-data; name="image"; '
+                'filename="big.jpg"\r\n'
+                'Content-Type: image/jpeg\r\n\r\n'
+            ).encode())
+            write_padded(body, jpeg(10, 10), UPLOAD_SIZE)
+            body.seek(0, 2)
+            body.write(f'\r\n--{BOUNDARY}--\r\n'.encode())
+            length = body.tell()
+            body.seek(0)
+            parser = MultiPartParser(
+                {
+                    'CONTENT_TYPE':
+                        f'multipart/form-data; boundary={BOUNDARY}',
+                    'CONTENT_LENGTH': length,
+                },
+                body,
+                [load_handler(h) for h in settings.FILE_UPLOAD_HANDLERS],
+            )
+            (_, files), peak = peak_memory(parser.parse)
+            upload = files['image']
+            self.assertIsInstance(upload, TemporaryUploadedFile)
+            self.assertEqual(upload.size, UPLOAD_SIZE)
+            upload.close()
+        self.assertLess(peak, MEMORY_LIMIT)
+
+    def test_large_upload_validated_from_header(self):
+        """Проверка файла в 50 МБ не читает его в память."""
+        upload = TemporaryUploadedFile(
+            'big.jpg', 'image/jpeg', UPLOAD_SIZE, None
+        )
+        write_padded(upload, jpeg(10, 10), UPLOAD_SIZE)
+        form = PostForm({'text': 'Текст'}, {'image': upload})
+        is_valid, peak = peak_memory(form.is_valid)
+        upload.close()
+        self.assertTrue(is_valid, form.errors)
+        self.assertLess(peak, MEMORY_LIMIT)
+
+    @override_settings(POST_IMAGE_MAX_SIZE=CHUNK_SIZE)
+    def test_upload_size_limit(self):
+        """Файл больше POST_IMAGE_MAX_SIZE отклоняется."""
+        upload = TemporaryUploadedFile(
+            'big.jpg', 'image/jpeg', CHUNK_SIZE + 1, None
+        )
+        write_padded(upload, jpeg(10, 10), CHUNK_SIZE + 1)
+        form = PostForm({'text': 'Текст'}, {'image': upload})
+        self.assertFalse(form.is_valid())
+        self.assertIn('image', form.errors)
+        upload.close()
+
+    def test_decompression_bomb_rejected(self):
+        """Изображение с огромным заявленным размером отклоняется
+        по заголовку.
+        """
+        for side in (7000, 100000):
+            with self.subTest(side=side):
+                upload = SimpleUploadedFile(
+                    'bomb.png', png_header(side, side), 'image/png'
+                )
+                form = PostForm({'text': 'Текст'}, {'image': upload})
+                with warnings.catch_warnings():
+                    warnings.simplefilter(
+                        'ignore', Image.DecompressionBombWarning
+                    )
+                    self.assertFalse(form.is_valid())
+                self.assertIn('image', form.errors)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, BACKGROUND_TASKS_EAGER=True)
+class UploadProcessingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='uploader')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    @override_settings(POST_IMAGE_MAX_SIDE=100)
+    def test_oversized_original_downscaled(self):
+        """Слишком большой исходник уменьшается после создания поста."""
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={
+                'text': 'Пост с большой картинкой',
+                'image': SimpleUploadedFile(
+                    'wide.jpg', jpeg(400, 40), 'image/jpeg'
+                ),
+            },
+        )
+        post = Post.objects.get(author=self.user)
+        with post.image.open() as file, Image.open(file) as image:
+            self.assertEqual(image.size, (100, 10))
+            self.assertEqual(image.format, 'JPEG')
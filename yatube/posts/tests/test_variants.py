@@ -0,0 +1,118 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from posts.models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def jpeg_upload(name, width, height):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'white').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    BACKGROUND_TASKS_EAGER=True,
+    POST_IMAGE_VARIANT_WIDTHS=(320, 640),
+    POST_IMAGE_VARIANT_FORMATS=('WEBP', 'JPEG'),
+)
+class ImageVariantsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='variants_author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def create_post(self, width=1000, height=500):
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={
+                'text': 'Пост с картинкой',
+                'image': jpeg_upload('photo.jpg', width, height),
+            },
+        )
+        return Post.objects.get(author=self.user)
+
+    def test_variants_generated_after_upload(self):
+        """После загрузки есть варианты всех ширин и форматов."""
+        post = self.create_post()
+        variants = {
+            (variant['type'], variant['width'], variant['height'])
+            for variant in post.variants
+        }
+        self.assertEqual(variants, {
+            ('image/webp', 320, 160), ('image/jpeg', 320, 160),
+            ('image/webp', 640, 320), ('image/jpeg', 640, 320),
+        })
+        for variant in post.variants:
+            with self.subTest(name=variant['name']):
+                self.assertTrue(default_storage.exists(variant['name']))
+
+    def test_variants_not_upscaled(self):
+        """Узкое изображение не растягивается до больших ширин."""
+        post = self.create_post(width=400, height=100)
+        self.assertEqual(
+            sorted({variant['width'] for variant in post.variants}),
+            [320, 400]
+        )
+
+    def test_picture_rendered(self):
+        """Пост выводится как <picture> с WebP и запасным JPEG."""
+        post = self.create_post()
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        webp = [v for v in post.variants if v['type'] == 'image/webp']
+        jpeg = [v for v in post.variants if v['type'] == 'image/jpeg']
+        self.assertContains(
+            response,
+            '<source type="image/webp" srcset="{}, {}"'.format(
+                *(f'{default_storage.url(v["name"])} {v["width"]}w'
+                  for v in webp)
+            )
+        )
+        self.assertContains(
+            response, f'src="{default_storage.url(jpeg[-1]["name"])}"'
+        )
+
+    def test_replaced_image_variants(self):
+        """Замена изображения заменяет варианты и удаляет старые файлы."""
+        post = self.create_post()
+        old_names = [variant['name'] for variant in post.variants]
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={
+                'text': post.text,
+                'image': jpeg_upload('other.jpg', 800, 800),
+            },
+        )
+        post.refresh_from_db()
+        self.assertIn('other', post.variants[0]['name'])
+        for name in old_names:
+            with self.subTest(name=name):
+                self.assertFalse(default_storage.exists(name))
+
+    def test_process_images_backfills_variants(self):
+        """Команда process_images создаёт недостающие варианты."""
+        post = self.create_post()
+        Post.objects.filter(pk=post.pk).update(image_variants='')
+        call_command('process_images', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(len(post.variants), 4)
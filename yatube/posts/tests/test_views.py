@@ -3,6 +3,7 @@ from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase
 from django.urls import reverse
+from posts import thumbnails
 from posts.models import Comment, Follow, Group, Post, User
 from posts.views import NUMBER_OF_POSTS
 
@@ -293,6 +294,8 @@ class CacheViewsTest(TestCase):
             group=cls.group,
             image=cls.uploaded
         )
+        # Миниатюры готовы заранее, как после загрузки через форму.
+        thumbnails.generate_thumbnails(cls.post.image.name)
 
     def setUp(self):
         self.guest_client = Client()
@@ -301,20 +304,46 @@ class CacheViewsTest(TestCase):
         cache.clear()
 
     def test_cache(self):
+        """Главная страница отдаётся из кэша, пока посты не менялись."""
         response = self.authorized_client.get(reverse('posts:index'))
         context = response.context['page_obj']
         content = response.content
         post = context[0]
         self.assertEqual(post.id, self.post.id)
-        Post.objects.get(pk=post.id).delete()
+        Post.objects.filter(pk=post.id).update(text='Текст без сигналов')
         new_response = self.authorized_client.get(reverse('posts:index'))
-        new_content = new_response.content
-        self.assertEqual(content, new_content)
+        self.assertTemplateNotUsed(new_response, 'posts/index.html')
+        self.assertEqual(content, new_response.content)
         cache.clear()
         new_new_response = self.authorized_client.get(reverse('posts:index'))
         new_new_content = new_new_response.content
         self.assertNotEqual(content, new_new_content)
 
+    def test_cache_invalidated_on_change(self):
+        """Изменение постов, групп и комментариев сбрасывает кэш лент."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=1',
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user}),
+        )
+        changes = (
+            lambda: Post.objects.create(author=self.user, text='Новый пост'),
+            lambda: Comment.objects.create(
+                post=self.post, author=self.user, text='Комментарий'
+            ),
+            lambda: Group.objects.filter(pk=self.group.pk).first().save(),
+            lambda: Post.objects.get(pk=self.post.pk).delete(),
+        )
+        for change in changes:
+            for url in urls:
+                self.guest_client.get(url)
+            change()
+            for url in urls:
+                with self.subTest(url=url):
+                    response = self.guest_client.get(url)
+                    self.assertIsNotNone(response.context)
+
 
 class FollowViewsTest(TestCase):
     @classmethod
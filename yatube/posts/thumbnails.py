@@ -0,0 +1,97 @@
+"""Миниатюры изображений постов.
+
+Миниатюры всех размеров из ``THUMBNAIL_SIZES`` создаются в фоне сразу
+после сохранения поста. Шаблоны только читают готовую миниатюру из
+хранилища sorl и, пока её нет, показывают исходное изображение.
+Адреса миниатюр всей страницы ленты читаются из хранилища за одно
+обращение (``resolve_thumbnails``).
+"""
+from core import tasks
+from django.core.cache import cache
+from django.utils import timezone
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings
+from sorl.thumbnail.images import ImageFile
+
+from .cache import bump_feed_version
+from .models import Post
+
+# Размеры, которые выводят шаблоны: имя -> (геометрия, параметры sorl).
+THUMBNAIL_SIZES = {
+    'card': ('960x339', {'padding': True, 'upscale': True}),
+}
+PENDING_KEY = 'thumbnail:pending:{}'
+PENDING_TIMEOUT = 60
+
+
+class Backend(ThumbnailBackend):
+    def get_thumbnail_file(self, file_, geometry_string, **options):
+        """Файл миниатюры с теми же именем и параметрами, что создаст
+        ``get_thumbnail``, без обращения к хранилищу.
+        """
+        source = ImageFile(file_)
+        if settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return ImageFile(name, default.storage)
+
+
+backend = Backend()
+
+
+def thumbnail_file(image, size):
+    geometry, options = THUMBNAIL_SIZES[size]
+    return backend.get_thumbnail_file(image, geometry, **options)
+
+
+def cached_thumbnail(image, size):
+    """Готовая миниатюра или ``None``, если её ещё не создали."""
+    return default.kvstore.get(thumbnail_file(image, size))
+
+
+def resolve_thumbnails(posts):
+    """Проставляет постам ``thumbnail_urls`` — адреса миниатюр всех
+    размеров, читая хранилище sorl один раз на все посты.
+    """
+    posts = [post for post in posts if post.image]
+    files = {
+        (post.pk, size): thumbnail_file(post.image, size)
+        for post in posts for size in THUMBNAIL_SIZES
+    }
+    found = default.kvstore.get_many(files.values())
+    pending = set()
+    for post in posts:
+        post.thumbnail_urls = {}
+        for size in THUMBNAIL_SIZES:
+            thumbnail = found.get(files[post.pk, size].key)
+            if thumbnail is None:
+                pending.add(post.image.name)
+                post.thumbnail_urls[size] = post.image.url
+            else:
+                post.thumbnail_urls[size] = thumbnail.url
+    for name in pending:
+        generate_later(name)
+
+
+def generate_thumbnails(name):
+    """Создаёт все миниатюры изображения и обновляет ленты."""
+    for geometry, options in THUMBNAIL_SIZES.values():
+        backend.get_thumbnail(name, geometry, **options)
+    cache.delete(PENDING_KEY.format(name))
+    # В закэшированных карточках и страницах пока исходное изображение.
+    Post.objects.filter(image=name).update(updated=timezone.now())
+    bump_feed_version()
+
+
+def generate_later(name):
+    """Ставит создание миниатюр в фоновый пул, если оно ещё не ждёт."""
+    if cache.add(PENDING_KEY.format(name), True, PENDING_TIMEOUT):
+        tasks.submit(generate_thumbnails, name)
@@ -0,0 +1,221 @@
+"""Материализованная лента подписок (fan-out on write).
+
+Новый пост автора сразу раскладывается в ленты его подписчиков
+(``TimelineEntry``). Для авторов, у которых подписчиков больше
+``TIMELINE_FANOUT_LIMIT``, раскладка не делается: их посты
+подмешиваются в ленту при чтении, чтобы один пост популярного автора
+не порождал миллионы строк.
+
+При подписке в ленту попадают только ``TIMELINE_BACKFILL`` последних
+постов автора; более старые читаются из постов автора напрямую,
+граница хранится в ``Follow.backfilled_to``. Страница ленты читается
+``TimelinePaginator`` по индексу записей ленты, а прямые источники
+подмешиваются к ней при чтении.
+"""
+from functools import partial, reduce
+from itertools import groupby
+from operator import attrgetter, itemgetter, or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from . import stats
+from .models import Follow, Post, TimelineEntry
+from .paginators import FORWARD, CursorPaginator
+
+CELEBRITIES_CACHE_KEY = 'timeline:celebrities'
+CELEBRITIES_CACHE_TIMEOUT = 60 * 5
+BATCH_SIZE = 1000
+
+
+def is_celebrity(count):
+    return count > settings.TIMELINE_FANOUT_LIMIT
+
+
+def celebrity_ids():
+    """ID авторов, чьи посты читаются из ленты без раскладки."""
+    ids = cache.get(CELEBRITIES_CACHE_KEY)
+    if ids is None:
+        ids = list(
+            Follow.objects.values('author').annotate(
+                followers=Count('id')
+            ).filter(
+                followers__gt=settings.TIMELINE_FANOUT_LIMIT
+            ).values_list('author', flat=True)
+        )
+        cache.set(CELEBRITIES_CACHE_KEY, ids, CELEBRITIES_CACHE_TIMEOUT)
+    return ids
+
+
+def forget_celebrities():
+    """Сбрасывает кэш популярных авторов сейчас и после фиксации
+    транзакции: иначе параллельный запрос успел бы закэшировать
+    прежний список до того, как изменились подписки.
+    """
+    cache.delete(CELEBRITIES_CACHE_KEY)
+    transaction.on_commit(partial(cache.delete, CELEBRITIES_CACHE_KEY))
+
+
+def fan_out_post(post):
+    """Раскладывает новый пост по лентам подписчиков автора."""
+    if is_celebrity(stats.followers_count(post.author_id)):
+        return
+    follower_ids = Follow.objects.filter(
+        author_id=post.author_id
+    ).values_list('user_id', flat=True)
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+         for user_id in follower_ids),
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def backfill(user_ids, author_id):
+    """Добавляет в ленты последние посты автора и запоминает в подписках,
+    до какой даты посты читаются напрямую.
+    """
+    limit = settings.TIMELINE_BACKFILL
+    posts = list(
+        Post.objects.filter(author_id=author_id).order_by(
+            '-pub_date', '-id'
+        ).values_list('id', 'pub_date')[:limit + 1]
+    )
+    backfilled_to = posts[limit][1] if len(posts) > limit else None
+    user_ids = list(user_ids)
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+         for user_id in user_ids for post_id, pub_date in posts[:limit]),
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    Follow.objects.filter(
+        user_id__in=user_ids, author_id=author_id
+    ).update(backfilled_to=backfilled_to)
+
+
+def on_follow(user_id, author_id):
+    on_follow_many([user_id], author_id)
+
+
+def on_follow_many(user_ids, author_id):
+    """Ленты после подписки пользователей на автора."""
+    count = stats.followers_count(author_id)
+    if not is_celebrity(count):
+        backfill(user_ids, author_id)
+    elif not is_celebrity(count - len(user_ids)):
+        # Автор только что перешёл в «популярные»: дальше его посты
+        # читаются напрямую.
+        forget_celebrities()
+
+
+def on_unfollow(user_id, author_id):
+    on_unfollow_many([user_id], author_id)
+
+
+def on_unfollow_many(user_ids, author_id):
+    """Ленты после отписки пользователей от автора."""
+    TimelineEntry.objects.filter(
+        user_id__in=user_ids, post__author_id=author_id
+    ).delete()
+    count = stats.followers_count(author_id)
+    if not is_celebrity(count) and is_celebrity(count + len(user_ids)):
+        # Автор вернулся к раскладке: его посты больше не подмешиваются
+        # при чтении, поэтому заполняем ленты оставшихся подписчиков.
+        forget_celebrities()
+        backfill(
+            Follow.objects.filter(author_id=author_id).values_list(
+                'user_id', flat=True
+            ),
+            author_id,
+        )
+
+
+def timeline_posts(user):
+    """Посты ленты подписок пользователя."""
+    fanned_out = TimelineEntry.objects.filter(user=user).values('post_id')
+    not_backfilled = Post.objects.filter(
+        author__following__user=user,
+        author__following__backfilled_to__gte=F('pub_date'),
+    ).values('id')
+    condition = Q(id__in=fanned_out) | Q(id__in=not_backfilled)
+    celebrities = celebrity_ids()
+    if celebrities:
+        condition |= Q(author_id__in=Follow.objects.filter(
+            user=user, author_id__in=celebrities
+        ).values('author_id'))
+    return Post.objects.filter(condition)
+
+
+class TimelinePaginator(CursorPaginator):
+    """Пажинатор ленты подписок.
+
+    Страница по курсору читается из записей ленты пользователя по
+    индексу (user, -pub_date, -post) без сортировки всей ленты. Посты
+    популярных авторов и посты старше границы подписки дочитываются
+    вторым запросом, только если такие подписки есть, и сливаются
+    со страницей по ключу. ``object_list`` — посты для выдачи, например
+    ``Post.objects.for_feed()``; номерные страницы читаются из него по
+    ``timeline_posts``.
+    """
+
+    def __init__(self, object_list, per_page, user, **kwargs):
+        self.user = user
+        self.posts = object_list
+        super().__init__(
+            object_list.filter(id__in=timeline_posts(user).values('id')),
+            per_page, **kwargs
+        )
+
+    def _rows(self, direction, values, limit):
+        # Условия на записи ленты и ключ поиска ставятся одним filter(),
+        # чтобы JOIN с записями был один и сортировка шла по индексу.
+        sources = [(
+            Q(timeline_entries__user=self.user),
+            ('timeline_entries__pub_date', 'timeline_entries__post__id'),
+        )]
+        direct = self._direct_condition()
+        if direct is not None:
+            sources.append((direct, self.keys))
+        descending = (direction == FORWARD) == self.descending
+        rows = {}
+        for condition, keys in sources:
+            if values is not None:
+                condition &= self._seek(values, direction, keys)
+            queryset = self.posts.filter(condition).order_by(*(
+                f'-{key}' if descending else key for key in keys
+            ))
+            for post in queryset[:limit]:
+                rows.setdefault(post.pk, post)
+        return sorted(
+            rows.values(), key=attrgetter(*self.keys), reverse=descending
+        )[:limit]
+
+    def _direct_condition(self):
+        """Условие на посты, которых нет в записях ленты, или None."""
+        celebrities = celebrity_ids()
+        follows = Follow.objects.filter(user=self.user).filter(
+            Q(backfilled_to__isnull=False) | Q(author_id__in=celebrities)
+        ).values_list('author_id', 'backfilled_to')
+        conditions = [
+            Q(author_id=author_id) if author_id in celebrities
+            else Q(author_id=author_id, pub_date__lte=backfilled_to)
+            for author_id, backfilled_to in follows
+        ]
+        return reduce(or_, conditions) if conditions else None
+
+
+def rebuild():
+    """Заполняет ленты заново по подпискам, например после загрузки
+    данных в обход сигналов.
+    """
+    TimelineEntry.objects.all().delete()
+    Follow.objects.update(backfilled_to=None)
+    forget_celebrities()
+    follows = Follow.objects.exclude(
+        author_id__in=celebrity_ids()
+    ).order_by('author_id').values_list('author_id', 'user_id')
+    for author_id, rows in groupby(follows.iterator(), key=itemgetter(0)):
+        backfill([user_id for _, user_id in rows], author_id)
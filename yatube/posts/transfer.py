@@ -0,0 +1,213 @@
+"""Потоковый импорт и экспорт групп, постов, комментариев и подписок.
+
+Строки читаются и пишутся по одной (NDJSON или CSV) и сохраняются
+пачками через ``bulk_create``, поэтому объём данных не ограничен
+памятью. Ключи сохраняются, ссылки на пользователей и посты — это их
+id: пользователи должны уже быть в БД, а данные загружаются в порядке
+group, post, comment, follow.
+
+Контрольная точка (checkpoint) — JSON-файл с числом обработанных строк,
+который обновляется после каждой зафиксированной пачки. Повторный
+запуск с той же точкой продолжает с места остановки; пачка,
+зафиксированная до сбоя, не задвоится: конфликты по ключу пропускаются.
+"""
+import contextlib
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import Comment, Follow, Group, Post
+
+MODELS = {
+    'group': Group,
+    'post': Post,
+    'comment': Comment,
+    'follow': Follow,
+}
+# Поля выгрузки. Производные данные (счётчики, варианты изображений,
+# ленты, поисковый индекс) не выгружаются, а пересчитываются после
+# загрузки.
+FIELDS = {
+    'group': ('id', 'title', 'slug', 'description'),
+    'post': (
+        'id', 'text', 'pub_date', 'updated', 'author_id', 'group_id',
+        'image',
+    ),
+    'comment': ('id', 'post_id', 'author_id', 'text', 'created'),
+    'follow': ('id', 'user_id', 'author_id'),
+}
+FORMATS = ('ndjson', 'csv')
+REPORT_INTERVAL = 5
+
+
+def guess_format(path):
+    return 'csv' if path.endswith('.csv') else 'ndjson'
+
+
+def read_rows(file, data_format):
+    """Словари строк файла по одному."""
+    if data_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+class RowWriter:
+    def __init__(self, file, data_format, fields, header=True):
+        self.file = file
+        self.fields = fields
+        self.csv = None
+        if data_format == 'csv':
+            self.csv = csv.writer(file)
+            if header:
+                self.csv.writerow(fields)
+
+    def write(self, values):
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ]
+        if self.csv is not None:
+            self.csv.writerow(['' if v is None else v for v in values])
+        else:
+            self.file.write(json.dumps(
+                dict(zip(self.fields, values)), ensure_ascii=False
+            ) + '\n')
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_python(model, row):
+    """Объект модели из строки файла; пустые значения CSV — ``None``
+    для полей, допускающих NULL.
+    """
+    values = {}
+    for name, value in row.items():
+        field = model._meta.get_field(name)
+        if value == '' and field.null:
+            value = None
+        values[field.attname] = field.to_python(value)
+    return model(**values)
+
+
+@contextlib.contextmanager
+def keep_dates(model):
+    """Не даёт ``auto_now`` и ``auto_now_add`` затереть загружаемые
+    даты.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def import_rows(name, rows, chunk_size, on_chunk):
+    """Сохраняет строки пачками, каждая пачка — своя транзакция."""
+    model = MODELS[name]
+    with keep_dates(model):
+        for chunk in chunks(rows, chunk_size):
+            objs = [to_python(model, row) for row in chunk]
+            with transaction.atomic():
+                model.objects.bulk_create(objs, ignore_conflicts=True)
+            on_chunk(len(objs))
+
+
+def export_rows(name, after_id=0, chunk_size=2000):
+    """Кортежи значений ``FIELDS[name]`` по возрастанию id.
+
+    ``iterator()`` читает строки пачками; на PostgreSQL это курсор
+    на стороне сервера.
+    """
+    return MODELS[name].objects.filter(pk__gt=after_id).order_by(
+        'pk'
+    ).values_list(*FIELDS[name]).iterator(chunk_size=chunk_size)
+
+
+def reset_sequences(name):
+    """После загрузки с явными id счётчик ключей БД (PostgreSQL)
+    должен продолжиться с максимального id.
+    """
+    sql = connection.ops.sequence_reset_sql(no_style(), [MODELS[name]])
+    with connection.cursor() as cursor:
+        for statement in sql:
+            cursor.execute(statement)
+
+
+class Checkpoint:
+    """Число обработанных строк, сохраняемое между запусками."""
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.rows = 0
+        self.data = {}
+        if path and os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            if data.get('source') == source:
+                self.rows = data['rows']
+                self.data = data
+
+    def save(self, rows, **data):
+        self.rows = rows
+        self.data = data
+        if not self.path:
+            return
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'source': self.source, 'rows': rows, **data}, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Progress:
+    """Пишет число обработанных строк и скорость не чаще раза
+    в ``REPORT_INTERVAL`` секунд.
+    """
+
+    def __init__(self, stream, done=0):
+        self.stream = stream
+        self.done = done
+        self.rows = 0
+        self.started = self.reported = time.monotonic()
+
+    def add(self, rows):
+        self.rows += rows
+        if time.monotonic() - self.reported >= REPORT_INTERVAL:
+            self.report()
+
+    def report(self):
+        self.reported = time.monotonic()
+        elapsed = self.reported - self.started
+        rate = self.rows / elapsed if elapsed else 0
+        self.stream.write(
+            f'{self.done + self.rows} строк, {rate:.0f} строк/с, '
+            f'{elapsed:.1f} с'
+        )
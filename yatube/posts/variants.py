@@ -0,0 +1,93 @@
+"""Адаптивные варианты изображений постов.
+
+Для каждого изображения создаются копии нескольких ширин в современных
+форматах и в JPEG для старых браузеров. Их список хранится в
+``Post.image_variants`` и выводится тегом ``{% post_picture %}``
+как ``<picture>`` с ``srcset``.
+"""
+import json
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+from .models import Post
+
+VARIANTS_DIR = 'variants'
+MIME_TYPES = {
+    'AVIF': 'image/avif',
+    'WEBP': 'image/webp',
+    'JPEG': 'image/jpeg',
+}
+EXTENSIONS = {'AVIF': 'avif', 'WEBP': 'webp', 'JPEG': 'jpg'}
+QUALITY = 80
+
+
+def supported_formats():
+    """Форматы из настроек, которые умеет сохранять установленный Pillow."""
+    Image.init()
+    return [
+        image_format for image_format in settings.POST_IMAGE_VARIANT_FORMATS
+        if image_format in Image.SAVE
+    ]
+
+
+def variant_widths(width):
+    """Ширины вариантов: изображение не растягивается."""
+    return sorted({
+        min(variant_width, width)
+        for variant_width in settings.POST_IMAGE_VARIANT_WIDTHS
+    })
+
+
+def render_variants(image, stem):
+    has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    variants = []
+    for width in variant_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for image_format in supported_formats():
+            buffer = BytesIO()
+            if image_format == 'JPEG':
+                resized.convert('RGB').save(buffer, 'JPEG', quality=QUALITY)
+            else:
+                resized.save(buffer, image_format, quality=QUALITY)
+            name = default_storage.save(
+                f'{VARIANTS_DIR}/{stem}-{width}w.{EXTENSIONS[image_format]}',
+                ContentFile(buffer.getvalue()),
+            )
+            variants.append({
+                'name': name,
+                'type': MIME_TYPES[image_format],
+                'width': width,
+                'height': height,
+            })
+    return variants
+
+
+def generate_variants(name):
+    """Создаёт варианты изображения и сохраняет их список в постах
+    с этим изображением. Файлы прежних вариантов удаляются.
+    """
+    with default_storage.open(name) as file, Image.open(file) as image:
+        variants = render_variants(image, os.path.splitext(name)[0])
+    posts = Post.objects.filter(image=name)
+    old_names = {
+        variant['name']
+        for data in posts.exclude(image_variants='').values_list(
+            'image_variants', flat=True
+        )
+        for variant in json.loads(data)['items']
+    }
+    posts.update(
+        image_variants=json.dumps({'source': name, 'items': variants}),
+        updated=timezone.now(),
+    )
+    for old_name in old_names - {variant['name'] for variant in variants}:
+        default_storage.delete(old_name)
+    return variants
@@ -1,32 +1,58 @@
+from core import writer
+from core.routers import read_from_replica, stick_to_primary
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
 
+from . import cards, follow_graph, images
+from .cache import cache_feed, feed_condition
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
+from .models import Group, Post, User
+from .paginators import CursorPaginator
+from .timeline import TimelinePaginator
 
 NUMBER_OF_POSTS = 10
+COMMENTS_PER_PAGE = 20
+RECOMMENDATIONS_ON_PAGE = 5
 
 
-def paginator(request, posts):
-    paginator = Paginator(posts, NUMBER_OF_POSTS)
-    page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+def paginator(request, posts, paginator_class=CursorPaginator, **kwargs):
+    paginator = paginator_class(posts, NUMBER_OF_POSTS, **kwargs)
+    if 'cursor' not in request.GET and 'page' in request.GET:
+        page = paginator.get_page(request.GET.get('page'))
+    else:
+        page = paginator.get_cursor_page(request.GET.get('cursor'))
+    cards.attach_cards(page.object_list)
+    return page
 
 
-@cache_page(20, key_prefix='index_page')
+def comments_page(request, post):
+    comments = post.comments.select_related('author').only(
+        'id', 'text', 'created', 'post_id', 'author_id', 'author__username'
+    )
+    paginator = CursorPaginator(
+        comments, COMMENTS_PER_PAGE, keys=('created', 'id'), descending=False
+    )
+    return paginator.get_cursor_page(request.GET.get('cursor'))
+
+
+@feed_condition
+@read_from_replica
+@cache_feed
 def index(request):
-    posts = Post.objects.select_related('group')
+    posts = Post.objects.for_feed()
     context = {
         'page_obj': paginator(request, posts),
     }
     return render(request, 'posts/index.html', context)
 
 
+@feed_condition
+@read_from_replica
+@cache_feed
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    posts = group.posts.for_feed()
 
     context = {
         'group': group,
@@ -35,9 +61,14 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@feed_condition
+@read_from_replica
+@cache_feed
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
+    author = get_object_or_404(
+        User.objects.select_related('stats'), username=username
+    )
+    posts = author.posts.for_feed()
     context = {
         'author': author,
         'page_obj': paginator(request, posts),
@@ -45,32 +76,68 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+@feed_condition
+@read_from_replica
+@cache_feed
 def post_detail(request, post_id):
     template_name = 'posts/post_detail.html'
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'), id=post_id
+    )
     form = CommentForm(request.POST or None)
-    comments = post.comments.all()
     context = {
         'post': post,
         'form': form,
+        'comments': comments_page(request, post),
+    }
+    return render(request, template_name, context)
+
+
+@read_from_replica
+def post_comments(request, post_id):
+    post = get_object_or_404(Post.objects.only('id'), id=post_id)
+    comments = comments_page(request, post)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created': comment.created.isoformat(),
+                }
+                for comment in comments
+            ],
+            'next_cursor': comments.next_cursor,
+        })
+    template_name = 'posts/includes/comment_list.html'
+    context = {
+        'post': post,
         'comments': comments,
     }
     return render(request, template_name, context)
 
 
 @login_required
+@stick_to_primary
 def post_create(request):
     template_name = 'posts/create_post.html'
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
-        post.save()
+        if post.image:
+            # Файл сохраняется до записи, чтобы не занимать писателя.
+            post.image.save(post.image.name, post.image.file, save=False)
+        writer.write(post.save)
+        if post.image:
+            images.process_upload_later(post.image.name)
         return redirect('posts:profile', post.author.username)
     return render(request, template_name, {'form': form})
 
 
 @login_required
+@stick_to_primary
 def post_edit(request, post_id):
     template_name = 'posts/create_post.html'
     post = get_object_or_404(Post, pk=post_id)
@@ -81,7 +148,10 @@ def post_edit(request, post_id):
         files=request.FILES or None,
         instance=post)
     if form.is_valid():
+        cards.forget_card(post)
         form.save()
+        if 'image' in form.changed_data and post.image:
+            images.process_upload_later(post.image.name)
         return redirect('posts:post_detail', post.id)
     context = {
         'title': 'Редактировать запись',
@@ -93,6 +163,7 @@ def post_edit(request, post_id):
 
 
 @login_required
+@stick_to_primary
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -100,39 +171,42 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        writer.write(comment.save)
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
+@feed_condition
+@read_from_replica
+@cache_feed(per_user=True)
 def follow_index(request):
     template_name = 'posts/follow.html'
-    user = request.user
-    authors = Follow.objects.filter(user=user).values('author')
-    posts = Post.objects.filter(author__in=authors)
+    posts = Post.objects.for_feed()
+    recommendations = request.user.recommendations.select_related(
+        'author'
+    ).order_by('-score')[:RECOMMENDATIONS_ON_PAGE]
     context = {
-        'page_obj': paginator(request, posts),
+        'page_obj': paginator(
+            request, posts, TimelinePaginator, user=request.user
+        ),
+        'recommendations': recommendations,
     }
     return render(request, template_name, context)
 
 
 @login_required
+@stick_to_primary
 def profile_follow(request, username):
-    if not request.user == User.objects.get(username=username):
-        Follow.objects.get_or_create(
-            user=request.user,
-            author=User.objects.get(username=username)
-        )
-        return redirect('posts:profile', username)
-    return redirect('posts:follow_index')
+    author = get_object_or_404(User.objects.only('id'), username=username)
+    if request.user.id == author.id:
+        return redirect('posts:follow_index')
+    writer.write(follow_graph.follow, request.user.id, author.id)
+    return redirect('posts:profile', username)
 
 
 @login_required
+@stick_to_primary
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
-    follow = Follow.objects.filter(
-        user=request.user,
-        author=author)
-    if request.user != author and follow.exists():
-        Follow.objects.filter(user=request.user, author=author).delete()
+    author = get_object_or_404(User.objects.only('id'), username=username)
+    writer.write(follow_graph.unfollow, request.user.id, author.id)
     return redirect('posts:profile', username)
@@ -0,0 +1,171 @@
+"""SQL полнотекстового индекса для SQLite и PostgreSQL.
+
+Индекс — отдельная таблица ``search_index``: на SQLite виртуальная
+таблица FTS5, на PostgreSQL — таблица с ``tsvector`` и индексом GIN.
+Строка индекса — текст поста или комментария и номер поста, к которому
+он относится. Номер строки кодирует документ (см. ``document_id``),
+поэтому обновление и удаление находят её по первичному ключу.
+"""
+TABLE = 'search_index'
+# Токенизаторы не считают «ё» и «е» одной буквой.
+FOLD_SQL = "replace(replace(text, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def fold(text):
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def document_id(kind, object_id):
+    """Номер строки индекса: посты чётные, комментарии нечётные."""
+    return object_id * 2 + (kind == 'comment')
+
+
+class SqliteBackend:
+    def create(self, cursor):
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE {TABLE} USING fts5('
+            'text, post_id UNINDEXED, '
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def match(self, words):
+        # Каждое слово в кавычках, чтобы ввод не разбирался как
+        # синтаксис FTS5; звёздочка — поиск по началу слова.
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def save(self, cursor, doc_id, post_id, text):
+        self.delete(cursor, doc_id)
+        cursor.execute(
+            f'INSERT INTO {TABLE} (rowid, text, post_id) VALUES (%s, %s, %s)',
+            [doc_id, text, post_id],
+        )
+
+    def delete(self, cursor, doc_id):
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [doc_id])
+
+    def rebuild(self, cursor, post_table, comment_table):
+        cursor.execute(f'DELETE FROM {TABLE}')
+        cursor.execute(
+            f'INSERT INTO {TABLE} (rowid, text, post_id) '
+            f'SELECT id * 2, {FOLD_SQL}, id FROM {post_table}'
+        )
+        cursor.execute(
+            f'INSERT INTO {TABLE} (rowid, text, post_id) '
+            f'SELECT id * 2 + 1, {FOLD_SQL}, post_id '
+            f'FROM {comment_table}'
+        )
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+    def count(self, cursor, match, limit):
+        cursor.execute(
+            f'SELECT count(*) FROM (SELECT DISTINCT post_id FROM {TABLE} '
+            f'WHERE {TABLE} MATCH %s LIMIT %s)',
+            [match, limit],
+        )
+        return cursor.fetchone()[0]
+
+    def post_ids(self, cursor, match, limit, offset, ranked):
+        if ranked:
+            # Скрытый столбец rank — это bm25: чем меньше, тем лучше.
+            sql = (
+                f'SELECT post_id FROM {TABLE} WHERE {TABLE} MATCH %s '
+                'GROUP BY post_id ORDER BY min(rank), post_id DESC'
+            )
+        else:
+            # Индекс отдаёт строки по убыванию rowid, и запрос
+            # останавливается, набрав страницу.
+            sql = (
+                f'SELECT DISTINCT post_id FROM {TABLE} '
+                f'WHERE {TABLE} MATCH %s ORDER BY rowid DESC'
+            )
+        cursor.execute(
+            f'{sql} LIMIT %s OFFSET %s', [match, limit, offset]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresBackend:
+    config = 'russian'
+
+    def create(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE {TABLE} ('
+            'id bigint PRIMARY KEY, post_id integer NOT NULL, '
+            'document tsvector NOT NULL)'
+        )
+        cursor.execute(
+            f'CREATE INDEX {TABLE}_document ON {TABLE} USING gin (document)'
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def match(self, words):
+        # В словах только буквы и цифры, экранировать нечего.
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def save(self, cursor, doc_id, post_id, text):
+        cursor.execute(
+            f'INSERT INTO {TABLE} (id, post_id, document) '
+            'VALUES (%s, %s, to_tsvector(%s, %s)) '
+            'ON CONFLICT (id) DO UPDATE SET '
+            'post_id = EXCLUDED.post_id, document = EXCLUDED.document',
+            [doc_id, post_id, self.config, text],
+        )
+
+    def delete(self, cursor, doc_id):
+        cursor.execute(f'DELETE FROM {TABLE} WHERE id = %s', [doc_id])
+
+    def rebuild(self, cursor, post_table, comment_table):
+        cursor.execute(f'TRUNCATE {TABLE}')
+        cursor.execute(
+            f'INSERT INTO {TABLE} (id, post_id, document) '
+            f'SELECT id * 2, id, to_tsvector(%s, {FOLD_SQL}) '
+            f'FROM {post_table}',
+            [self.config],
+        )
+        cursor.execute(
+            f'INSERT INTO {TABLE} (id, post_id, document) '
+            f'SELECT id * 2 + 1, post_id, to_tsvector(%s, {FOLD_SQL}) '
+            f'FROM {comment_table}',
+            [self.config],
+        )
+
+    def count(self, cursor, match, limit):
+        cursor.execute(
+            f'SELECT count(*) FROM (SELECT DISTINCT post_id FROM {TABLE} '
+            'WHERE document @@ to_tsquery(%s, %s) LIMIT %s) AS found',
+            [self.config, match, limit],
+        )
+        return cursor.fetchone()[0]
+
+    def post_ids(self, cursor, match, limit, offset, ranked):
+        if ranked:
+            order = 'ORDER BY max(ts_rank(document, query)) DESC, post_id DESC'
+        else:
+            order = 'ORDER BY max(id) DESC'
+        cursor.execute(
+            f'SELECT post_id FROM {TABLE}, to_tsquery(%s, %s) AS query '
+            f'WHERE document @@ query GROUP BY post_id {order} '
+            'LIMIT %s OFFSET %s',
+            [self.config, match, limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': SqliteBackend(),
+    'postgresql': PostgresBackend(),
+}
+
+
+def get_backend(connection):
+    try:
+        return BACKENDS[connection.vendor]
+    except KeyError:
+        raise NotImplementedError(
+            f'Поиск не поддерживает БД {connection.vendor}'
+        ) from None
@@ -0,0 +1,97 @@
+"""Поиск по постам и комментариям.
+
+Индекс обновляется сигналами при сохранении и удалении постов
+и комментариев; ``rebuild`` заполняет его заново по данным (например,
+после загрузки в обход сигналов). Пост находится и по своему тексту,
+и по тексту комментариев к нему.
+"""
+import re
+from functools import cached_property
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from posts.models import Comment, Post
+
+from .backends import document_id, fold, get_backend
+
+WORD_RE = re.compile(r'\w+')
+MAX_WORDS = 10
+
+
+def save_document(kind, object_id, post_id, text, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        get_backend(connection).save(
+            cursor, document_id(kind, object_id), post_id, fold(text)
+        )
+
+
+def delete_document(kind, object_id, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        get_backend(connection).delete(cursor, document_id(kind, object_id))
+
+
+def rebuild(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        get_backend(connection).rebuild(
+            cursor, Post._meta.db_table, Comment._meta.db_table
+        )
+
+
+class SearchResults:
+    """Посты, найденные по запросу, для ``Paginator``.
+
+    Выдача ограничена ``SEARCH_MAX_RESULTS`` постами и отсортирована
+    по релевантности. Если совпадений больше, запрос слишком общий:
+    ранжировать все совпадения дорого, поэтому выводятся посты
+    с самыми новыми совпадениями. Из таблицы постов читается только
+    нужная страница.
+    """
+
+    def __init__(self, query, using=None):
+        self.using = using or router.db_for_read(Post)
+        self.connection = connections[self.using]
+        self.backend = get_backend(self.connection)
+        words = WORD_RE.findall(fold(query).lower())[:MAX_WORDS]
+        self.match = self.backend.match(words) if words else None
+
+    @cached_property
+    def found(self):
+        """Число найденных постов, не больше ``SEARCH_MAX_RESULTS + 1``."""
+        if self.match is None:
+            return 0
+        with self.connection.cursor() as cursor:
+            return self.backend.count(
+                cursor, self.match, settings.SEARCH_MAX_RESULTS + 1
+            )
+
+    @property
+    def truncated(self):
+        return self.found > settings.SEARCH_MAX_RESULTS
+
+    def count(self):
+        return min(self.found, settings.SEARCH_MAX_RESULTS)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None:
+            raise TypeError('Результаты поиска поддерживают только срезы')
+        start = item.start or 0
+        stop = min(item.stop, self.count())
+        if start >= stop:
+            return []
+        with self.connection.cursor() as cursor:
+            ids = self.backend.post_ids(
+                cursor, self.match, stop - start, start,
+                ranked=not self.truncated,
+            )
+        posts = Post.objects.using(self.using).for_feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search(query):
+    return SearchResults(query)
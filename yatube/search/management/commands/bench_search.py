@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from posts.management.commands._bench import bench_database, best_time, seed
+from posts.models import Post
+from posts.views import NUMBER_OF_POSTS
+from search.index import SearchResults, rebuild
+
+# Слово во всех постах, в одном посте и ни в одном.
+QUERIES = ('поста', '424242', 'котлета')
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты во временную БД SQLite и сравнивает первую '
+        'страницу поиска (число результатов и 10 постов) через LIKE '
+        'и через индекс FTS5.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--tmpdir', help='Каталог для временной БД.'
+        )
+
+    def handle(self, *args, **options):
+        with bench_database(options['tmpdir']) as alias:
+            self.stdout.write(f'Загружаем {options["posts"]} постов...')
+            seed(alias, options['posts'], stdout=self.stdout)
+            started = time.monotonic()
+            rebuild(using=alias)
+            self.stdout.write(
+                f'Индекс построен за {time.monotonic() - started:.1f} с'
+            )
+            posts = Post.objects.using(alias).for_feed()
+            self.stdout.write(
+                f'{"запрос":<12}{"найдено":>10}{"LIKE, мс":>12}'
+                f'{"FTS5, мс":>12}'
+            )
+            for query in QUERIES:
+                like = posts.filter(text__icontains=query).order_by(
+                    '-pub_date'
+                )
+                found = SearchResults(query, using=alias)
+                self.stdout.write(
+                    f'{query:<12}{found.count():>10}'
+                    f'{self.measure(like, options["repeat"]):>12.2f}'
+                    f'{self.measure(found, options["repeat"]):>12.2f}'
+                )
+
+    def measure(self, results, repeat):
+        def first_page():
+            page = Paginator(results, NUMBER_OF_POSTS).page(1)
+            list(page.object_list)
+        return best_time(first_page, repeat)
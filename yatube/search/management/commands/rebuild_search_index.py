@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет поисковый индекс заново по постам и комментариям, '
+        'например после загрузки данных в обход сигналов.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            rebuild()
+        self.stdout.write(
+            f'Индекс перестроен за {time.monotonic() - started:.1f} с'
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-17 09:12
+
+from django.db import migrations
+
+from search.backends import get_backend
+
+
+def create_index(apps, schema_editor):
+    backend = get_backend(schema_editor.connection)
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    with schema_editor.connection.cursor() as cursor:
+        backend.create(cursor)
+        backend.rebuild(cursor, Post._meta.db_table, Comment._meta.db_table)
+
+
+def drop_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        get_backend(schema_editor.connection).drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
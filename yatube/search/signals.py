@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from posts.models import Comment, Post
+
+from . import index
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        index.save_document(
+            'post', instance.pk, instance.pk, instance.text, using=using
+        )
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        index.save_document(
+            'comment', instance.pk, instance.post_id, instance.text,
+            using=using,
+        )
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, using, **kwargs):
+    index.delete_document('post', instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, using, **kwargs):
+    index.delete_document('comment', instance.pk, using=using)
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Comment, Post, User
+from posts.views import NUMBER_OF_POSTS
+from search.index import SearchResults, rebuild
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='searcher')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def found(self, query):
+        results = SearchResults(query)
+        return list(results[:results.count()])
+
+    def test_post_indexed_on_save_and_delete(self):
+        """Пост находится после создания и правки и пропадает из
+        поиска после удаления.
+        """
+        post = Post.objects.create(author=self.user, text='Ёжик в тумане')
+        self.assertEqual(self.found('ежик'), [post])
+        post.text = 'Лошадка в тумане'
+        post.save()
+        self.assertEqual(self.found('ежик'), [])
+        self.assertEqual(self.found('лошадка туман'), [post])
+        post.delete()
+        self.assertEqual(self.found('туман'), [])
+
+    def test_post_found_by_comment(self):
+        """Пост находится по тексту комментария, пока тот не удалён."""
+        post = Post.objects.create(author=self.user, text='Обычный пост')
+        comment = Comment.objects.create(
+            post=post, author=self.user, text='Интересное замечание'
+        )
+        self.assertEqual(self.found('замечание'), [post])
+        comment.delete()
+        self.assertEqual(self.found('замечание'), [])
+
+    def test_results_ranked(self):
+        """Пост с большим числом совпадений выше в выдаче."""
+        weak = Post.objects.create(
+            author=self.user, text='Кот ' + 'и собака ' * 10
+        )
+        strong = Post.objects.create(author=self.user, text='Кот кот кот')
+        self.assertEqual(self.found('кот'), [strong, weak])
+
+    def test_query_syntax_escaped(self):
+        """Служебные символы и слова запроса не ломают поиск."""
+        post = Post.objects.create(author=self.user, text='Ошибка NEAR AND')
+        for query in ('"ошибка', 'near AND', 'ошибка*)', '-:^'):
+            with self.subTest(query=query):
+                expected = [post] if query != '-:^' else []
+                self.assertEqual(self.found(query), expected)
+
+    def test_rebuild(self):
+        """Пересборка индексирует посты, загруженные в обход сигналов."""
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Загружено пачкой')
+        ])
+        self.assertEqual(self.found('пачкой'), [])
+        rebuild()
+        self.assertEqual(len(self.found('пачкой')), 1)
+
+    def test_search_page_paginated(self):
+        """Страница поиска выводит результаты по NUMBER_OF_POSTS."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Находка номер {i}')
+            for i in range(NUMBER_OF_POSTS + 3)
+        )
+        rebuild()
+        url = reverse('search:index')
+        response = self.client.get(url, {'q': 'находка'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page_obj'].paginator.count, 13)
+        self.assertEqual(len(response.context['page_obj']), NUMBER_OF_POSTS)
+        response = self.client.get(url, {'q': 'находка', 'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 3)
+        response = self.client.get(url)
+        self.assertEqual(response.context['page_obj'].paginator.count, 0)
+
+    @override_settings(SEARCH_MAX_RESULTS=3)
+    def test_broad_query_shows_newest(self):
+        """Слишком общий запрос выводит самые новые посты из первых
+        SEARCH_MAX_RESULTS.
+        """
+        posts = [
+            Post.objects.create(author=self.user, text=f'Частое слово {i}')
+            for i in range(5)
+        ]
+        results = SearchResults('слово')
+        self.assertTrue(results.truncated)
+        self.assertEqual(results.count(), 3)
+        self.assertEqual(list(results[:10]), posts[:1:-1])
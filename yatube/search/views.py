@@ -0,0 +1,20 @@
+from core.routers import read_from_replica
+from django.core.paginator import Paginator
+from django.shortcuts import render
+from posts import cards
+from posts.views import NUMBER_OF_POSTS
+
+from .index import search
+
+
+@read_from_replica
+def index(request):
+    query = request.GET.get('q', '').strip()
+    paginator = Paginator(search(query), NUMBER_OF_POSTS)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    cards.attach_cards(page_obj.object_list)
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+    }
+    return render(request, 'search/index.html', context)
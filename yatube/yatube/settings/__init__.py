@@ -0,0 +1,27 @@
+"""Настройки проекта.
+
+Профиль выбирается переменной окружения DJANGO_ENV:
+
+* dev — локальная разработка (по умолчанию);
+* test — тесты, выбирается сам при запуске ``manage.py test`` и pytest;
+* prod — боевой сервер.
+
+Профиль можно указать и напрямую:
+``DJANGO_SETTINGS_MODULE=yatube.settings.prod``.
+"""
+import os
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+
+RUNNING_TESTS = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'test' if RUNNING_TESTS else 'dev')
+
+if DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif DJANGO_ENV == 'test':
+    from .test import *  # noqa: F401,F403
+elif DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f'Неизвестный профиль DJANGO_ENV={DJANGO_ENV}')
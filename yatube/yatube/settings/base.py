@@ -0,0 +1,323 @@
+"""Общие настройки всех профилей, см. yatube/settings/__init__.py."""
+import os
+import tempfile
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = '&z(o_0ae33aiy6aens0=dx+klw&m9gzvx%ufww06v_x-#ksxzk'
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+
+# Application definition
+
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static'),
+]
+
+INSTALLED_APPS = [
+    'sorl.thumbnail',
+    'about.apps.AboutConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'search.apps.SearchConfig',
+    'api.apps.ApiConfig',
+    'core.apps.CoreConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Последним: заполняет дырки страниц до заголовков сессии и CSRF.
+    'core.holes.HoleMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+# Компилировать шаблоны при запуске процесса. Имеет смысл только
+# с кэширующим загрузчиком, см. профиль prod.
+TEMPLATE_WARMUP = False
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+# БД выбирается переменной окружения DB_ENGINE: sqlite (по умолчанию)
+# или postgresql (нужен пакет psycopg2 < 2.9 — таков предел Django 2.2).
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+# Сколько секунд держать соединение с БД между запросами.
+CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'yatube'),
+            'USER': os.getenv('DB_USER', 'yatube'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(
+                'DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')
+            ),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'OPTIONS': {
+                # Сколько секунд ждать блокировку записи, а не падать
+                # с «database is locked».
+                'timeout': 20,
+            },
+        }
+    }
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite
+# (см. core.db). WAL позволяет читать во время записи, а synchronous
+# = NORMAL в режиме WAL не теряет целостность при сбое процесса.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    # Отрицательное значение — размер в килобайтах: 64 МБ.
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+
+# Реплики только для чтения (core.routers): в DB_REPLICAS через запятую
+# перечисляются файлы SQLite или хосты PostgreSQL. Копии SQLite
+# обновляет команда sync_replicas.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(','))
+):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST' if DB_ENGINE == 'postgresql' else 'NAME': replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Модели каких приложений можно читать с реплик. Сессии и пользователи
+# читаются из основной БД, чтобы вход на сайт действовал сразу.
+REPLICA_APPS = ('posts',)
+
+# Сколько секунд реплика может отставать: столько после записи
+# пользователь читает основную БД, и столько после изменения данных
+# живут страницы ленты, построенные по реплике.
+REPLICA_LAG = 5
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+LOGIN_URL = 'users:login'
+
+LOGIN_REDIRECT_URL = 'posts:index'
+
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+# Кэш выбирается переменной окружения CACHE_BACKEND:
+# locmem — свой у каждого процесса (по умолчанию),
+# file — общий для всех процессов сервера,
+# redis — общий для всех серверов (нужен пакет django-redis).
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.getenv(
+                'CACHE_LOCATION', 'redis://127.0.0.1:6379/1'
+            ),
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'SERIALIZER': 'core.cache.CompressedPickleSerializer',
+            },
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv(
+                'CACHE_LOCATION',
+                os.path.join(tempfile.gettempdir(), 'yatube_cache')
+            ),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.CompressedLocMemCache',
+        }
+    }
+
+# Страницы ленты сбрасываются сменой версии при изменении данных,
+# поэтому срок жизни может быть большим.
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Сколько ещё после устаревания страницу можно отдавать, пока её
+# перестраивает другой запрос.
+FEED_CACHE_STALE = 60 * 10
+
+# Сколько секунд держится блокировка перестройки страницы.
+FEED_CACHE_LOCK_TIMEOUT = 10
+
+# Коэффициент вероятностного раннего обновления (XFetch): чем больше,
+# тем раньше начинается перестройка.
+FEED_CACHE_EARLY_BETA = 1.0
+
+# Карточки постов сбрасываются сменой Post.updated, поэтому срок
+# жизни ограничивает только объём кэша.
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Лента подписок: авторы с большим числом подписчиков не раскладываются
+# по лентам при публикации, их посты подмешиваются при чтении.
+TIMELINE_FANOUT_LIMIT = 1000
+
+# Сколько последних постов автора попадает в ленту при подписке. Более
+# старые посты не теряются: лента дочитывает их из постов автора.
+TIMELINE_BACKFILL = 200
+
+# Загрузки крупнее этого размера сразу пишутся во временный файл,
+# а не держатся в памяти процесса.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+
+# Ограничения на изображения постов. Размеры в пикселях берутся
+# из заголовка файла, до декодирования изображения.
+POST_IMAGE_MAX_SIZE = 50 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS = 40_000_000
+POST_IMAGE_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+
+# Исходные изображения больше этого размера по длинной стороне
+# уменьшаются в фоне после загрузки.
+POST_IMAGE_MAX_SIDE = 2560
+
+# Адаптивные варианты изображений постов: ширины и форматы по порядку
+# предпочтения. Форматы, которые не умеет сохранять установленный
+# Pillow (AVIF до Pillow 11.3), пропускаются; JPEG — для старых
+# браузеров.
+POST_IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280)
+POST_IMAGE_VARIANT_FORMATS = ('AVIF', 'WEBP', 'JPEG')
+
+# Метаданные миниатюр читаются пачкой на всю страницу ленты.
+THUMBNAIL_KVSTORE = 'posts.kvstore.KVStore'
+
+# Пул потоков для фоновых задач (например, создания миниатюр).
+BACKGROUND_WORKERS = 2
+
+# Выполнять фоновые задачи сразу, в текущем потоке (профиль test).
+BACKGROUND_TASKS_EAGER = False
+
+# Очередь записей с одним потоком-писателем и групповой фиксацией
+# транзакций (core.writer). Снимает «database is locked» на SQLite.
+WRITE_QUEUE_ENABLED = os.getenv('WRITE_QUEUE_ENABLED') == '1'
+WRITE_QUEUE_SIZE = 1000
+# Сколько записей из очереди выполняется одной транзакцией.
+WRITE_QUEUE_BATCH_SIZE = 100
+# Сколько секунд ждать места в очереди и фиксации записи.
+WRITE_QUEUE_TIMEOUT = 30
+
+# Сколько постов выводит поиск. Если совпадений больше, они не
+# ранжируются по релевантности: выводятся самые новые.
+SEARCH_MAX_RESULTS = 1000
@@ -0,0 +1,5 @@
+"""Локальная разработка."""
+from .base import *  # noqa: F401,F403
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
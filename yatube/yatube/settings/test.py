@@ -0,0 +1,24 @@
+"""Тесты."""
+import atexit
+import shutil
+import tempfile
+
+from .base import *  # noqa: F401,F403
+
+# Загрузки, миниатюры и варианты картинок пишутся во временный каталог,
+# а не в media/ проекта.
+MEDIA_ROOT = tempfile.mkdtemp(prefix='yatube_media_')
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+
+# Результат фоновой задачи виден тесту сразу, а временные каталоги
+# не удаляются из-под работающего потока.
+BACKGROUND_TASKS_EAGER = True
+
+# Быстрый хешер: пароли в тестах не секрет.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.CompressedLocMemCache',
+    }
+}